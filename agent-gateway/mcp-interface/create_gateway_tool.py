@@ -5,8 +5,12 @@ import zipfile
 import time 
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
+robot_actions_path = os.path.join(script_dir, '..', '..', 'lambda-common', 'robot_actions.py')
 config_path = os.path.join(script_dir, "config.json")
 
+# Tools exposed by the lambda target (one JSON schema per tool)
+TOOL_SPEC_FILES = ["tool_spec.json", "tool_spec_command_batch.json"]
+
 def load_config():
     config = None    
     with open(config_path, "r", encoding="utf-8") as f:
@@ -522,6 +526,8 @@ def update_lambda_function_arn():
                     file_path = os.path.join(root, file)
                     arcname = os.path.relpath(file_path, lambda_dir)
                     zip_file.write(file_path, arcname)
+            # Bundle the shared action registry next to lambda_function.py
+            zip_file.write(robot_actions_path, 'robot_actions.py')
         print(f"✓ Lambda function zip created successfully: {lambda_function_zip_path}")
     except Exception as e:
         print(f"Failed to create Lambda function zip: {e}")
@@ -823,6 +829,25 @@ def main():
     print(f"lambda_function_arn: {lambda_function_arn}")
 
     print("4. Getting or creating lambda target...")
+    tool_specs = [json.load(open(os.path.join(script_dir, file_name))) for file_name in TOOL_SPEC_FILES]
+    lambda_target_config = {
+        "mcp": {
+            "lambda": {
+                "lambdaArn": lambda_function_arn, 
+                "toolSchema": {
+                    "inlinePayload": tool_specs
+                }
+            }
+        }
+    }
+
+    credential_config = [ 
+        {
+            "credentialProviderType" : "GATEWAY_IAM_ROLE"
+        }
+    ]
+
+    target_created = False
     target_id = config.get('target_id', "")
     if not target_id:
         response = gateway_client.list_gateway_targets(
@@ -839,24 +864,7 @@ def main():
                 break
         
         if not target_id:       
-            TOOL_SPEC = json.load(open(os.path.join(script_dir, "tool_spec.json")))     
             print("Creating lambda target...")
-            lambda_target_config = {
-                "mcp": {
-                    "lambda": {
-                        "lambdaArn": lambda_function_arn, 
-                        "toolSchema": {
-                            "inlinePayload": [TOOL_SPEC]
-                        }
-                    }
-                }
-            }
-
-            credential_config = [ 
-                {
-                    "credentialProviderType" : "GATEWAY_IAM_ROLE"
-                }
-            ]
             response = gateway_client.create_gateway_target(
                 gatewayIdentifier=gateway_id,
                 name=targetname,
@@ -870,6 +878,22 @@ def main():
             config['target_id'] = target_id
             with open(config_path, "w", encoding="utf-8") as f:
                 json.dump(config, f, indent=2)
+            target_created = True
+
+    if not target_created:
+        # Keep the tool schema of an existing target in sync with TOOL_SPEC_FILES
+        try:
+            print("Updating lambda target tool schema...")
+            response = gateway_client.update_gateway_target(
+                gatewayIdentifier=gateway_id,
+                targetId=target_id,
+                name=targetname,
+                description=f'{targetname} for {projectName}',
+                targetConfiguration=lambda_target_config,
+                credentialProviderConfigurations=credential_config)
+            print(f"✓ Lambda target updated with tools: {', '.join(spec['name'] for spec in tool_specs)}")
+        except Exception as e:
+            print(f"Failed to update lambda target: {e}")
 
     print(f"target_name: {targetname}, target_id: {target_id}")
 
@@ -1,73 +1,33 @@
-import json
 import boto3
-import os
+import time
 import traceback
+from robot_actions import build_payload, new_correlation_id, UnknownActionError
 
-bedrock_agent_runtime_client = boto3.client("bedrock-agent-runtime")
+# Created once per container and reused across warm invocations
+iot_client = boto3.client(
+    'iot-data',
+    region_name='ap-northeast-2'
+)
 
-def command_robot(action: str, message: str) -> str:
-    client = boto3.client(
-        'iot-data',
-        region_name='ap-northeast-2'
-    )        
+topic = "robot/control"
+
+# Keep a batch well inside the Lambda timeout (60 seconds)
+MAX_BATCH_STEPS = 20
+MAX_BATCH_DELAY = 30
+
+def command_robot(action: str, message: str, correlation_id: str = None) -> str:
     print('action: ', action)
 
-    say = ""
     if message:
         print('message: ', message)
-        say = message
-    
-    move = ""
-    if action == "탐지" or action == "detected":
-        move = ['detected']
-    elif action == "from1to2":
-        move = ['from1to2']
-    elif action == "from2to0":
-        move = ['from2to0']
-    elif action == "from0to1":
-        move = ['from0to1']
-    elif action == "normal":
-        move = ['normal']
-    elif action == "heart":
-        move = ['heart']
-    elif action == "stretch":
-        move = ['stretch']
-    elif action == "scrape":
-        move = ['scrape']
-    elif action == "dance1" or action == "dance1":
-        move = ['dance1']
-    elif action == "dance2" or action == "dance2":
-        move = ['dance2']
-    elif action == "행복해" or action == "heart":
-        move = ['heart']
-    elif action == "피곤해" or action == "stretch":
-        move = ['stretch']
-    elif action == "반가워" or action == "heart":
-        move = ['heart']
-    elif action == "춤춰봐" or action == 'dance"':
-        move = ['dance1']
-    elif action == "앉아" or action == "sit":
-        move = ['sit']
-    elif action == "일어서" or action == "stand":
-        move = ['stand']
-    else:
-        move = [action]
 
-    if say:
-        payload = json.dumps({
-            "move": move,
-            "say": say
-        })
-    else:
-        payload = json.dumps({
-            "move": move
-        })
-                        
-    topic = f"robot/control"  # for testing
+    # Raises UnknownActionError before anything is published
+    payload = build_payload(action, message, correlation_id)
+
     print('topic: ', topic)
 
     try:         
-        response = client.publish(
+        response = iot_client.publish(
             topic = topic,
             qos = 1,
             payload = payload
@@ -80,6 +40,54 @@ def command_robot(action: str, message: str) -> str:
         print('error message: ', err_msg)                    
         return False
 
+def command_batch(steps: list) -> dict:
+    """Publish an ordered list of {action, message, delay} steps in one invocation"""
+    if not isinstance(steps, list) or not steps:
+        raise ValueError("steps must be a non-empty list")
+    if len(steps) > MAX_BATCH_STEPS:
+        raise ValueError(f"Too many steps: {len(steps)} (max {MAX_BATCH_STEPS})")
+
+    # Validate every step before publishing anything
+    payloads = []
+    total_delay = 0
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict):
+            raise ValueError(f"Step {index} must be an object with action, message and delay")
+        delay = step.get('delay') or 0
+        if not isinstance(delay, (int, float)) or delay < 0:
+            raise ValueError(f"Step {index} has an invalid delay: {delay}")
+        total_delay += delay
+        correlation_id = new_correlation_id()
+        payloads.append((build_payload(step.get('action'), step.get('message'), correlation_id), correlation_id, delay))
+
+    if total_delay > MAX_BATCH_DELAY:
+        raise ValueError(f"Total delay {total_delay}s exceeds {MAX_BATCH_DELAY}s")
+
+    print('topic: ', topic)
+    published = []
+    for index, (payload, correlation_id, delay) in enumerate(payloads):
+        try:
+            response = iot_client.publish(
+                topic = topic,
+                qos = 1,
+                payload = payload
+            )
+            print(f'step {index} response: ', response)
+            published.append(correlation_id)
+        except Exception:
+            err_msg = traceback.format_exc()
+            print('error message: ', err_msg)
+            break
+
+        if delay and index < len(payloads) - 1:
+            time.sleep(delay)
+
+    return {
+        'published': len(published),
+        'total': len(payloads),
+        'correlation_ids': published
+    }
+
 def lambda_handler(event, context):
     print(f"event: {event}")
     print(f"context: {context}")
@@ -99,10 +107,37 @@ def lambda_handler(event, context):
     print(f"message: {message}")
 
     if toolName == 'command':
-        result = command_robot(action, message)
+        # Stamped on the MQTT payload; pass it to await_command_result to wait for completion
+        correlation_id = event.get('correlation_id') or new_correlation_id()
+        print(f"correlation_id: {correlation_id}")
+        try:
+            result = command_robot(action, message, correlation_id)
+        except UnknownActionError as e:
+            print(f"error message: {e}")
+            return {
+                'statusCode': 400,
+                'body': str(e)
+            }
         print(f"result: {result}")
         return {
-            'statusCode': 200, 
+            'statusCode': 200 if result else 500, 
+            'body': {
+                'published': result,
+                'correlation_id': correlation_id
+            }
+        }
+    elif toolName == 'command_batch':
+        try:
+            result = command_batch(event.get('steps'))
+        except ValueError as e:  # includes UnknownActionError
+            print(f"error message: {e}")
+            return {
+                'statusCode': 400,
+                'body': str(e)
+            }
+        print(f"result: {result}")
+        return {
+            'statusCode': 200 if result['published'] == result['total'] else 500, 
             'body': result
         }
     else:
@@ -1,6 +1,6 @@
 import json
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from pathlib import Path
 
@@ -15,6 +15,15 @@ class Config:
     model_id: str = "us.anthropic.claude-3-5-haiku-20241022-v1:0"
     max_retries: int = 2
     request_timeout: int = 10
+    state_cache: bool = False  # Consume the robot queues in the background for get_robot_state
+    hazard_monitor: dict = field(default_factory=dict)  # {"enabled": true, "debounce_seconds": 120, ...}
+    robot_backend: dict = field(default_factory=dict)  # {"type": "sqs" | "simulator" | "replay", ...}
+    image_cache: dict = field(default_factory=dict)  # {"enabled": true, "max_entries": 256, "ttl_seconds": 86400, "disk_dir": null}
+    image_fetch: dict = field(default_factory=dict)  # {"max_pixels": 921600, "jpeg_quality": 85}
+    prompt_cache: bool = True  # Bedrock prompt-cache checkpoints after the system prompt and tool specs
+    intent_router: dict = field(default_factory=dict)  # {"enabled": true, "fuzzy_threshold": 0.85}
+    model_tiers: dict = field(default_factory=dict)  # {"enabled": true, "fast_model_id": "...", "report_tools": [...], ...}
+    history_compaction: dict = field(default_factory=dict)  # {"enabled": true, "token_budget": 16000, "keep_recent_turns": 2}
     
     @classmethod
     def from_config_file(cls) -> 'Config':
@@ -31,6 +40,15 @@ class Config:
             return cls(
                 mcp_server_url=config_data.get("gateway_url", ""),
                 model_id=config_data.get("model_id", "us.anthropic.claude-3-5-haiku-20241022-v1:0"),
+                state_cache=config_data.get("state_cache", False),
+                hazard_monitor=config_data.get("hazard_monitor", {}),
+                robot_backend=config_data.get("robot_backend", {}),
+                image_cache=config_data.get("image_cache", {}),
+                image_fetch=config_data.get("image_fetch", {}),
+                prompt_cache=config_data.get("prompt_cache", True),
+                intent_router=config_data.get("intent_router", {}),
+                model_tiers=config_data.get("model_tiers", {}),
+                history_compaction=config_data.get("history_compaction", {}),
                 bearer_token=None  # Will be obtained from SSM at runtime
             )
             
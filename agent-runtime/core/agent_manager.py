@@ -1,12 +1,20 @@
 import logging
-from typing import Optional, Any
+import threading
+from typing import Optional, Any, Dict
 from strands import Agent
 from strands.models import BedrockModel
 from config.config import Config
 from core.mcp_manager import MCPServerManager
+from core.model_router import TieredModel
+from memory.compaction import CompactingConversationManager
 from prompts.prompt import ORCHESTRATOR_PROMPT
 from tools.observer_env_agent import observe_env_agent
-from tools.robot_tools import get_robot_feedback, get_robot_detection, get_robot_gesture, wait_for_seconds
+from tools.robot_tools import get_robot_feedback, get_robot_detection, get_robot_gesture, wait_for_seconds, await_command_result, analyze_robot_images
+from tools.robot_state import get_robot_state
+from tools.hazard_monitor import get_hazard_alerts
+from tools.prompt_metrics import measure_prompt_tokens, set_prompt_source
+from tools.patrol import run_patrol
+from tools.robot_command import set_command_sender, mcp_command_sender, local_command_sender
 
 
 class AgentManager:
@@ -18,6 +26,11 @@ class AgentManager:
         self.logger = logging.getLogger(__name__)
         self.agent: Optional[Agent] = None
         self.mcp_client: Optional[Any] = None
+        self.tools: list = []
+        # Mode of the last successful initialize(); background work reuses it
+        self.debug: Optional[bool] = None
+        self._init_lock = threading.RLock()
+        self._standalone_agents: Dict[str, Agent] = {}
     
     def initialize(self, debug: bool = False) -> bool:
         """Initialize the agent with MCP tools and local tools
@@ -32,7 +45,13 @@ class AgentManager:
                 get_robot_feedback,
                 get_robot_detection,
                 get_robot_gesture,
-                wait_for_seconds
+                wait_for_seconds,
+                await_command_result,
+                analyze_robot_images,
+                get_robot_state,
+                get_hazard_alerts,
+                measure_prompt_tokens,
+                run_patrol
             ]
             
             if debug:
@@ -40,6 +59,9 @@ class AgentManager:
                 self.logger.info("Debug mode: Skipping MCP tool integration, using only local tools")
                 all_tools = local_tools
                 mcp_client = None
+                # Simulated/replayed robots complete commands without the Gateway
+                if self.config.robot_backend.get("type", "sqs") != "sqs":
+                    set_command_sender(local_command_sender)
             else:
                 # Load tools from Bedrock AgentCore Gateway MCP server
                 mcp_tools, mcp_client = self.mcp_manager.load_tools()
@@ -49,10 +71,20 @@ class AgentManager:
                 
                 all_tools = mcp_tools + local_tools
                 self.logger.info(f"Loaded {len(mcp_tools)} AgentCore MCP tools and {len(local_tools)} local tools")
+                
+                # Let local tools (run_patrol) send commands without a model turn
+                command_tool = self._find_command_tool(mcp_tools)
+                if command_tool:
+                    set_command_sender(mcp_command_sender(mcp_client, command_tool))
+                else:
+                    self.logger.warning("Gateway command tool not found; run_patrol is unavailable")
             
             # Create the agent
             if self._create_agent(all_tools):
                 self.mcp_client = mcp_client
+                self.tools = all_tools
+                self.debug = debug
+                self._standalone_agents.clear()
                 self.logger.info(f"Agent initialized successfully with {len(all_tools)} total tools")
                 return True
             else:
@@ -62,19 +94,66 @@ class AgentManager:
             self.logger.error(f"Error initializing agent: {str(e)}", exc_info=True)
             return False
     
+    def _find_command_tool(self, mcp_tools: list) -> Optional[str]:
+        """Name of the Gateway command tool (e.g. mcp-interface___command)"""
+        for mcp_tool in mcp_tools:
+            name = getattr(mcp_tool, 'tool_name', '')
+            if name == "command" or name.endswith("___command"):
+                return name
+        return None
+    
+    def _create_bedrock_model(self, model_id: str) -> BedrockModel:
+        """Bedrock model with prompt-cache checkpoints after the system prompt and the tool specs,
+        so later turns read them from the cache instead of paying for them again"""
+        if not self.config.prompt_cache:
+            return BedrockModel(model_id=model_id)
+        return BedrockModel(
+            model_id=model_id,
+            cache_prompt="default",
+            cache_tools="default"
+        )
+    
+    def _create_model(self):
+        """The configured model, or a TieredModel that sends tool-orchestration turns
+        to model_tiers.fast_model_id and keeps model_id for reports and reasoning"""
+        tiers = self.config.model_tiers
+        if not tiers.get("enabled") or not tiers.get("fast_model_id"):
+            return self._create_bedrock_model(self.config.model_id)
+        self.logger.info(f"Model tiering: fast={tiers['fast_model_id']}, strong={self.config.model_id}")
+        return TieredModel(
+            fast_model=self._create_bedrock_model(tiers["fast_model_id"]),
+            strong_model=self._create_bedrock_model(self.config.model_id),
+            settings=tiers
+        )
+    
+    def _create_conversation_manager(self) -> Optional[CompactingConversationManager]:
+        """Keeps recent turns verbatim and summarizes older tool results once the session
+        history exceeds history_compaction.token_budget (None keeps the Strands default)"""
+        settings = self.config.history_compaction
+        if not settings.get("enabled", True):
+            return None
+        return CompactingConversationManager(
+            token_budget=settings.get("token_budget", 16000),
+            keep_recent_turns=settings.get("keep_recent_turns", 2),
+            max_summary_chars=settings.get("max_summary_chars", 300)
+        )
+    
     def _create_agent(self, tools: list) -> bool:
         """Create Strands Agent with the provided tools"""
         try:
             self.logger.info("Creating Strands Agent with tools...")
             
-            model = BedrockModel(model_id=self.config.model_id)
-            
             self.agent = Agent(
-                model=model,
+                model=self._create_model(),
                 tools=tools,
-                system_prompt=ORCHESTRATOR_PROMPT
+                system_prompt=ORCHESTRATOR_PROMPT,
+                conversation_manager=self._create_conversation_manager()
             )
             
+            agent = self.agent
+            set_prompt_source(self.config.model_id, ORCHESTRATOR_PROMPT,
+                              lambda: agent.tool_registry.get_all_tool_specs())
+            
             self.logger.info("Agent created successfully")
             return True
             
@@ -82,6 +161,25 @@ class AgentManager:
             self.logger.error(f"Error creating agent: {str(e)}", exc_info=True)
             return False
     
+    def get_standalone_agent(self, system_prompt: str) -> Optional[Agent]:
+        """Separate agent with the loaded tools and its own conversation, created once per
+        system prompt (used for background work so it never shares message state with user
+        sessions). Callers reset agent.messages before each use and must not share it across threads."""
+        with self._init_lock:
+            # Never re-initialize in another mode: that would replace the user session's agent
+            debug = self.debug if self.debug is not None else False
+            if not self.ensure_initialized(debug=debug):
+                return None
+            agent = self._standalone_agents.get(system_prompt)
+            if agent is None:
+                agent = Agent(
+                    model=self._create_model(),
+                    tools=self.tools,
+                    system_prompt=system_prompt
+                )
+                self._standalone_agents[system_prompt] = agent
+            return agent
+    
     def is_initialized(self, debug: bool = False) -> bool:
         """Check if agent is properly initialized"""
         if debug:
@@ -101,6 +199,10 @@ class AgentManager:
     
     def ensure_initialized(self, debug: bool = False) -> bool:
         """Ensure agent is initialized, attempt initialization if not"""
+        with self._init_lock:
+            return self._ensure_initialized(debug)
+    
+    def _ensure_initialized(self, debug: bool) -> bool:
         if self.is_initialized(debug=debug):
             return True
         
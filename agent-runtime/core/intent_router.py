@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import re
+import time
+from difflib import SequenceMatcher
+from typing import Optional, Dict, Any, AsyncGenerator
+from tools.robot_command import send_command
+from utils.shared import robot_actions
+
+
+# Single-action requests answered without the agent: move -> phrases, built from the
+# shared registry (ACTIONS in lambda-common/robot_actions.py) so the router and the command
+# Lambdas accept the same phrases. Patrol requests in natural language are left to the agent.
+INTENT_ALIASES = {move: [move] + aliases for move, aliases in robot_actions.ACTIONS.items()}
+
+# Voice message the robot says and the confirmation streamed back to the user
+INTENT_RESPONSES = {
+    'detected': ("탐지 자세를 취합니다", "로봇이 탐지 동작을 하도록 명령했습니다."),
+    'from0to1': ("포인트 1로 이동합니다", "로봇을 포인트 1로 이동시켰습니다."),
+    'from1to2': ("포인트 2로 이동합니다", "로봇을 포인트 2로 이동시켰습니다."),
+    'from2to0': ("복귀합니다", "로봇을 시작 지점으로 복귀시켰습니다."),
+    'normal': ("기본 자세로 돌아갑니다", "로봇을 기본 자세로 되돌렸습니다."),
+    'stop_move': ("정지합니다", "로봇을 정지시켰습니다."),
+    'stand': ("일어설게요", "로봇이 일어서도록 명령했습니다."),
+    'sit': ("앉을게요", "로봇이 앉도록 명령했습니다."),
+    'hello': ("안녕하세요", "로봇이 인사하도록 명령했습니다."),
+    'stretch': ("스트레칭할게요", "로봇이 스트레칭하도록 명령했습니다."),
+    'scrape': ("긁을게요", "로봇이 긁기 동작을 하도록 명령했습니다."),
+    'heart': ("반가워요", "로봇이 하트 동작을 하도록 명령했습니다."),
+    'dance1': ("춤출게요", "로봇이 춤추도록 명령했습니다."),
+    'dance2': ("다른 춤을 출게요", "로봇이 두 번째 춤을 추도록 명령했습니다."),
+}
+
+# Politeness endings and punctuation stripped before matching ("앉아줘!" -> "앉아"). A bare 해/둬
+# is not stripped ("피곤해" is an alias), so forms like "그만해" are registry aliases themselves
+_SUFFIXES = re.compile(r'(\s*(해\s*줘|줘|요|주세요|please))+$')
+_PUNCTUATION = re.compile(r'[\s!.~,]+$')
+# Digits and ASCII letters that distinguish variants ("dance2" vs "dance1", "hello2" vs "hello")
+_VARIANT_CHARS = re.compile(r'[0-9a-z_\s]+')
+# Longer requests are sentences ("앉아 있는 사람 있어?") that need the agent
+MAX_ROUTED_CHARS = 15
+
+
+class IntentRouter:
+    """Routes short single-action requests straight to the robot command, skipping the agent"""
+
+    def __init__(self, settings: Optional[dict] = None):
+        settings = settings or {}
+        self.enabled = settings.get("enabled", True)
+        self.fuzzy_threshold = settings.get("fuzzy_threshold", 0.85)
+        self.logger = logging.getLogger(__name__)
+        self._aliases = {
+            alias.lower(): move for move, aliases in INTENT_ALIASES.items() for alias in aliases
+        }
+
+    def _is_variant(self, text: str, alias: str) -> bool:
+        """True when text and alias differ only by digits or an ASCII suffix, which usually
+        names another move (or one this router does not know) rather than a typo"""
+        if re.sub(r'\d', '', text) == re.sub(r'\d', '', alias):
+            return True
+        shorter, longer = sorted((text, alias), key=len)
+        return longer.startswith(shorter) and bool(_VARIANT_CHARS.fullmatch(longer[len(shorter):]))
+
+    def _normalize(self, text: str) -> str:
+        text = _PUNCTUATION.sub('', text.strip().lower())
+        if text in self._aliases:
+            return text
+        return _PUNCTUATION.sub('', _SUFFIXES.sub('', text))
+
+    def match(self, user_message: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return {"action", "alias", "confidence", "method"} for a routable request, None otherwise"""
+        if not self.enabled or not isinstance(user_message, str):
+            return None
+        if '?' in user_message or len(user_message.strip()) > MAX_ROUTED_CHARS:
+            return None
+
+        text = self._normalize(user_message)
+        if not text:
+            return None
+        if text in self._aliases:
+            return {"action": self._aliases[text], "alias": text, "confidence": 1.0, "method": "exact"}
+
+        best_alias, best_score = None, 0.0
+        for alias in self._aliases:
+            score = SequenceMatcher(None, text, alias).ratio()
+            if score > best_score:
+                best_alias, best_score = alias, score
+        if best_score >= self.fuzzy_threshold and best_alias and self._is_variant(text, best_alias):
+            self.logger.info(f"Intent router: '{text}' is a variant of '{best_alias}', leaving it to the agent")
+            return None
+        if best_score >= self.fuzzy_threshold:
+            return {
+                "action": self._aliases[best_alias],
+                "alias": best_alias,
+                "confidence": round(best_score, 3),
+                "method": "fuzzy"
+            }
+        return None
+
+    async def dispatch(self, intent: Dict[str, Any], agent: Any = None,
+                       user_message: str = "") -> Optional[AsyncGenerator[Dict[str, Any], None]]:
+        """Send the command; returns the stream of events, or None to fall back to the agent"""
+        start = time.perf_counter()
+        voice_message, confirmation = INTENT_RESPONSES.get(
+            intent["action"], (None, f"로봇에 {intent['action']} 동작을 명령했습니다."))
+        result = await asyncio.to_thread(send_command, intent["action"], voice_message)
+        if "error" in result:
+            self.logger.warning(f"Routed command failed, falling back to the agent: {result['error']}")
+            return None
+
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.logger.info(f"Routed '{user_message}' to {intent['action']} ({intent['method']}) in {latency_ms}ms")
+
+        # Keep the session history coherent for later agent turns
+        if agent is not None:
+            agent.messages.append({"role": "user", "content": [{"text": user_message}]})
+            agent.messages.append({"role": "assistant", "content": [{"text": confirmation}]})
+
+        async def events():
+            yield {
+                "type": "tool_use",
+                "tool_name": "command",
+                "tool_input": {"action": intent["action"], "message": voice_message},
+                "tool_id": result.get("correlation_id", "")
+            }
+            yield {
+                "type": "chunk",
+                "data": confirmation,
+            }
+            yield {
+                "type": "complete",
+                "final_response": confirmation,
+                "routed": {**intent, "correlation_id": result.get("correlation_id"), "latency_ms": latency_ms}
+            }
+        return events()
@@ -0,0 +1,99 @@
+import logging
+import time
+from typing import Optional, Dict, Any, List
+from strands.models.model import Model
+
+
+# Tool results after which the next turn writes the final report (strong model)
+DEFAULT_REPORT_TOOLS = ["run_patrol", "observe_env_agent", "analyze_robot_images"]
+# User requests that need judgement rather than tool orchestration (strong model)
+DEFAULT_REASONING_KEYWORDS = ["보고서", "분석", "판단", "평가", "왜", "이유", "report", "analyze", "why"]
+
+
+class TieredModel(Model):
+    """Routes each model turn to a fast model (tool selection, waiting loops) or the
+    configured strong model (final reports, ambiguous reasoning)
+
+    Rules (config.json "model_tiers"):
+    - the turn right after a report_tools result -> strong (writes the report)
+    - a new user request containing a reasoning_keywords word -> strong
+    - every other turn -> fast
+    Each turn's metadata event gets a "tier" block with the model, latency and cost.
+    """
+
+    def __init__(self, fast_model: Model, strong_model: Model, settings: Optional[dict] = None):
+        settings = settings or {}
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.report_tools = set(settings.get("report_tools", DEFAULT_REPORT_TOOLS))
+        self.reasoning_keywords = [keyword.lower() for keyword in settings.get("reasoning_keywords", DEFAULT_REASONING_KEYWORDS)]
+        # model_id -> [USD per 1K input tokens, USD per 1K output tokens]
+        self.prices: Dict[str, List[float]] = settings.get("prices", {})
+        self.logger = logging.getLogger(__name__)
+
+    def update_config(self, **model_config: Any) -> None:
+        self.strong_model.update_config(**model_config)
+
+    def get_config(self) -> Any:
+        return self.strong_model.get_config()
+
+    def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        return self.strong_model.structured_output(output_model, prompt, system_prompt=system_prompt, **kwargs)
+
+    def _model_id(self, model: Model) -> str:
+        config = model.get_config()
+        return config.get("model_id", "") if isinstance(config, dict) else ""
+
+    def select_tier(self, messages: list) -> tuple:
+        """(tier, reason) for the next turn"""
+        if not messages:
+            return "fast", "empty"
+        last = messages[-1]
+        content = last.get("content") or []
+
+        tool_results = [block for block in content if "toolResult" in block]
+        if tool_results:
+            result_ids = {block["toolResult"].get("toolUseId") for block in tool_results}
+            previous = messages[-2] if len(messages) > 1 else {}
+            for block in previous.get("content") or []:
+                tool_use = block.get("toolUse")
+                if tool_use and tool_use.get("toolUseId") in result_ids and tool_use.get("name") in self.report_tools:
+                    return "strong", f"report after {tool_use['name']}"
+            return "fast", "tool result"
+
+        text = " ".join(block.get("text", "") for block in content).lower()
+        for keyword in self.reasoning_keywords:
+            if keyword in text:
+                return "strong", f"keyword '{keyword}'"
+        return "fast", "tool orchestration"
+
+    def _cost(self, model_id: str, usage: Dict[str, Any]) -> Optional[float]:
+        price = self.prices.get(model_id)
+        if not price:
+            return None
+        input_tokens = (usage.get("inputTokens", 0) or 0) + (usage.get("cacheReadInputTokens", 0) or 0) \
+            + (usage.get("cacheWriteInputTokens", 0) or 0)
+        return round(input_tokens / 1000 * price[0] + (usage.get("outputTokens", 0) or 0) / 1000 * price[1], 6)
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        tier, reason = self.select_tier(messages)
+        model = self.strong_model if tier == "strong" else self.fast_model
+        model_id = self._model_id(model)
+        self.logger.info(f"Model tier: {tier} ({model_id}) - {reason}")
+
+        start = time.perf_counter()
+        async for event in model.stream(messages, tool_specs, system_prompt, **kwargs):
+            if isinstance(event, dict) and "metadata" in event:
+                usage = event["metadata"].get("usage", {})
+                cost = self._cost(model_id, usage)
+                strong_cost = self._cost(self._model_id(self.strong_model), usage)
+                event["metadata"]["tier"] = {
+                    "tier": tier,
+                    "reason": reason,
+                    "model_id": model_id,
+                    "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+                    "cost_usd": cost,
+                    # What the same tokens would have cost on the strong model
+                    "saved_usd": round(strong_cost - cost, 6) if cost is not None and strong_cost is not None else None,
+                }
+            yield event
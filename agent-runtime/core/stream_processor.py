@@ -2,6 +2,10 @@ import logging
 from typing import AsyncGenerator, Dict, Any
 
 
+# Bedrock usage fields summed over the model turns of one request
+USAGE_FIELDS = ("inputTokens", "outputTokens", "cacheReadInputTokens", "cacheWriteInputTokens")
+
+
 class StreamProcessor:
     """Handles streaming response processing"""
     
@@ -10,6 +14,9 @@ class StreamProcessor:
     
     async def process_stream(self, stream, user_message: str) -> AsyncGenerator[Dict[str, Any], None]:
         """Process streaming events from the agent"""
+        usage_totals = {field: 0 for field in USAGE_FIELDS}
+        model_turns = 0
+        tier_totals: Dict[str, Dict[str, Any]] = {}
         try:
             self.logger.info("Processing message with Strands Agent (streaming)...")
             
@@ -44,21 +51,59 @@ class StreamProcessor:
                     result = event["result"]
                     final_response = self._extract_final_response(result)
                     
+                    request_usage = self._cache_usage(usage_totals)
+                    request_usage["model_turns"] = model_turns
+                    if tier_totals:
+                        request_usage["model_tiers"] = tier_totals
+                    self.logger.info(f"Request token usage: {request_usage}")
+                    
                     yield {
                         "type": "complete",
-                        "final_response": final_response
+                        "final_response": final_response,
+                        "usage": request_usage
                     }
                 elif "event" in event and "metadata" in event["event"]:
                     metadata = event["event"]["metadata"]
+                    usage = metadata.get("usage", {})
+                    model_turns += 1
+                    for field in USAGE_FIELDS:
+                        usage_totals[field] += usage.get(field, 0) or 0
+                    
+                    # Set by TieredModel when model tiering is enabled
+                    tier = metadata.get("tier")
+                    if tier:
+                        totals = tier_totals.setdefault(tier["tier"], {
+                            "model_id": tier["model_id"], "turns": 0, "latency_ms": 0.0, "cost_usd": 0.0, "saved_usd": 0.0})
+                        totals["turns"] += 1
+                        totals["latency_ms"] = round(totals["latency_ms"] + tier["latency_ms"], 1)
+                        totals["cost_usd"] = round(totals["cost_usd"] + (tier.get("cost_usd") or 0), 6)
+                        totals["saved_usd"] = round(totals["saved_usd"] + (tier.get("saved_usd") or 0), 6)
+                    
                     yield {
                         "type": "metadata",
-                        "metadata": metadata
+                        "metadata": metadata,
+                        "prompt_cache": self._cache_usage(usage),
+                        "model_tier": tier
                     }
                     
         except Exception as e:
             self.logger.error(f"Error in streaming mode: {str(e)}", exc_info=True)
             yield {"error": f"Error processing request with agent: {str(e)}"}
     
+    def _cache_usage(self, usage: Dict[str, Any]) -> Dict[str, Any]:
+        """Prompt-cache summary of a Bedrock usage block (inputTokens excludes cached tokens)"""
+        input_tokens = usage.get("inputTokens", 0) or 0
+        cache_read = usage.get("cacheReadInputTokens", 0) or 0
+        cache_write = usage.get("cacheWriteInputTokens", 0) or 0
+        prompt_tokens = input_tokens + cache_read + cache_write
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": usage.get("outputTokens", 0) or 0,
+            "cache_read_input_tokens": cache_read,
+            "cache_write_input_tokens": cache_write,
+            "cache_hit_ratio": round(cache_read / prompt_tokens, 3) if prompt_tokens else 0.0
+        }
+    
     def _extract_final_response(self, result) -> str:
         """Extract final response text from result object"""
         if hasattr(result, 'message') and hasattr(result.message, 'content'):
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+IntentRouter 매칭 테스트 스크립트 (라우팅되어야 하는 표현 / 에이전트로 넘겨야 하는 표현)
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.intent_router import INTENT_ALIASES, INTENT_RESPONSES, IntentRouter
+from utils.shared import robot_actions
+
+
+# 표현 -> 라우팅되어야 하는 동작
+MUST_ROUTE = {
+    "앉아": "sit",
+    "앉아줘!": "sit",
+    "앉아 주세요": "sit",
+    "sit down please": "sit",
+    "일어서": "stand",
+    "일어나요": "stand",
+    "stop": "stop_move",
+    "멈춰": "stop_move",
+    "정지해": "stop_move",
+    "그만해": "stop_move",
+    "그만해요": "stop_move",
+    "그만둬": "stop_move",
+    "그만둬요!": "stop_move",
+    "안녕하세요~": "hello",
+    "인사해줘": "hello",
+    "피곤해": "stretch",
+    "행복해": "heart",
+    "춤춰봐": "dance1",
+    "dance2": "dance2",
+    "scrape": "scrape",
+    "from0to1": "from0to1",
+}
+
+# 에이전트로 넘겨야 하는 표현 (질문, 문장, 순찰 요청, 모르는 변형)
+MUST_NOT_ROUTE = [
+    "앉아 있는 사람 있어?",
+    "지금 뭐 하고 있어?",
+    "순찰해줘",
+    "위험 상황 감지해줘",
+    "로봇이 넘어진 사람을 발견하면 멈춰",
+    "dance3",
+    "hello2",
+    "그만 좀 하고 상황 보고해줘",
+    "",
+]
+
+
+def test_registry_sync():
+    """모든 레지스트리 동작과 별칭이 라우터 별칭 표와 확인 메시지에 있는지 확인합니다."""
+    assert set(INTENT_ALIASES) == set(robot_actions.ACTIONS)
+    assert set(INTENT_RESPONSES) == set(robot_actions.ACTIONS)
+    for move, aliases in robot_actions.ACTIONS.items():
+        assert robot_actions.resolve_action(move) == move
+        for alias in aliases:
+            assert robot_actions.resolve_action(alias) == move, alias
+    print(f"✅ 레지스트리 동작 {len(robot_actions.ACTIONS)}개 동기화")
+
+
+def test_must_route():
+    router = IntentRouter()
+    for phrase, action in MUST_ROUTE.items():
+        intent = router.match(phrase)
+        assert intent is not None and intent["action"] == action, (phrase, intent)
+        print(f"✅ '{phrase}' -> {action} ({intent['method']})")
+
+
+def test_must_not_route():
+    router = IntentRouter()
+    for phrase in MUST_NOT_ROUTE:
+        intent = router.match(phrase)
+        assert intent is None, (phrase, intent)
+        print(f"✅ '{phrase}' -> 에이전트")
+
+
+if __name__ == "__main__":
+    test_registry_sync()
+    test_must_route()
+    test_must_not_route()
+    print("\n🎉 모든 테스트가 완료되었습니다!")
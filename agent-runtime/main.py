@@ -4,6 +4,11 @@ from config.config import Config
 from core.mcp_manager import MCPServerManager
 from core.agent_manager import AgentManager
 from core.stream_processor import StreamProcessor
+from core.intent_router import IntentRouter
+from tools.robot_state import start_state_consumer
+from tools.robot_tools import get_robot_backend
+from tools.hazard_monitor import start_hazard_monitor
+from prompts.prompt import HAZARD_RESPONSE_PROMPT, HAZARD_EVENT_TEMPLATE
 from utils.logger import LoggerSetup
 
 
@@ -16,6 +21,39 @@ app = BedrockAgentCoreApp()
 # Initialize managers
 mcp_manager = MCPServerManager(config)
 agent_manager = AgentManager(config, mcp_manager)
+intent_router = IntentRouter(config.intent_router)
+
+
+def respond_to_hazard(event):
+    """Proactive response to a new HIGH-risk hazard, on a separate agent so user sessions are untouched"""
+    agent = agent_manager.get_standalone_agent(HAZARD_RESPONSE_PROMPT)
+    if agent is None:
+        raise RuntimeError("Agent could not be initialized for the hazard response")
+    # Responses run one at a time on the hazard worker; each event starts a fresh conversation
+    agent.messages = []
+    hazards = ", ".join(
+        f"{hazard.get('class')} (신뢰도 {hazard.get('confidence')}, 위험도 {hazard.get('risk_level', 'HIGH')})"
+        for hazard in event["hazards"]
+    )
+    response = agent(HAZARD_EVENT_TEMPLATE.format(
+        robot_id=event["robot_id"],
+        detected_at=event["detected_at"],
+        hazards=hazards,
+        filename=event.get("filename") or "없음",
+        roi_filename=event.get("roi_filename") or "없음",
+    ))
+    logger.info(f"Hazard response for {event['robot_id']}: {response}")
+    return response
+
+
+# Keep the robot state cache warm from the robot backend (SQS by default) for the lifetime of the container
+hazard_settings = dict(config.hazard_monitor)
+if config.state_cache or hazard_settings.get("enabled"):
+    start_state_consumer(get_robot_backend)
+
+# Respond to new HIGH-risk detections without waiting for a user request
+if hazard_settings.pop("enabled", False):
+    start_hazard_monitor(respond_to_hazard, hazard_settings)
 
 
 @app.entrypoint
@@ -58,6 +96,16 @@ async def strands_agent_bedrock_streaming(payload, context):
         yield {"error": error_msg}
         return
 
+    # Simple single-action requests ("앉아", "stop") go straight to the robot without a model turn
+    intent = intent_router.match(user_message)
+    if intent:
+        logger.info(f"Intent router matched: {intent}")
+        routed_events = await intent_router.dispatch(intent, agent, user_message)
+        if routed_events is not None:
+            async for event in routed_events:
+                yield event
+            return
+
     # Process the stream
     stream = agent.stream_async(user_message)
     stream_processor = StreamProcessor(logger)
@@ -0,0 +1,176 @@
+from strands.agent.conversation_manager import ConversationManager
+from strands.types.exceptions import ContextWindowOverflowException
+import json
+import logging
+import re
+from typing import TYPE_CHECKING, Optional, Any, List, Dict
+from tools.prompt_metrics import ESTIMATED_CHARS_PER_TOKEN
+
+if TYPE_CHECKING:
+    from strands import Agent
+
+logger = logging.getLogger(__name__)
+
+
+# Images and documents in tool results are counted as a fixed size
+BINARY_BLOCK_TOKENS = 1600
+COMPACTED_PREFIX = "[compacted]"
+_S3_URL = re.compile(r's3://[^\s"\'\\,\]\}]+')
+
+
+def estimate_tokens(messages: List[dict]) -> int:
+    """Approximate input tokens of a message list"""
+    chars = 0
+    binary_blocks = 0
+    for message in messages:
+        for block in message.get("content") or []:
+            if "text" in block:
+                chars += len(block["text"])
+            elif "toolUse" in block:
+                chars += len(json.dumps(block["toolUse"].get("input", {}), ensure_ascii=False)) + 40
+            elif "toolResult" in block:
+                for item in block["toolResult"].get("content") or []:
+                    if "text" in item:
+                        chars += len(item["text"])
+                    elif "json" in item:
+                        chars += len(json.dumps(item["json"], ensure_ascii=False, default=str))
+                    else:
+                        binary_blocks += 1
+            else:
+                binary_blocks += 1
+    return int(chars / ESTIMATED_CHARS_PER_TOKEN) + binary_blocks * BINARY_BLOCK_TOKENS
+
+
+def summarize_tool_result(tool_name: str, tool_result: dict, max_chars: int = 300) -> str:
+    """Compact stand-in for an old tool result: status, counts, detected classes and S3 URLs"""
+    texts = []
+    for item in tool_result.get("content") or []:
+        if "text" in item:
+            texts.append(item["text"])
+        elif "json" in item:
+            texts.append(json.dumps(item["json"], ensure_ascii=False, default=str))
+    raw = "\n".join(texts)
+
+    parts = [f"{COMPACTED_PREFIX} {tool_name}"]
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        data = None
+
+    if isinstance(data, dict):
+        for key in ("status", "message_count", "error", "correlation_id", "steps_completed"):
+            if data.get(key) is not None:
+                parts.append(f"{key}={data[key]}")
+        classes = sorted({
+            result.get("class")
+            for message in data.get("messages") or [] if isinstance(message, dict)
+            for result in message.get("results") or [] if isinstance(result, dict) and result.get("class")
+        })
+        if classes:
+            parts.append(f"classes={','.join(classes)}")
+    elif raw:
+        parts.append(raw[:max_chars].replace("\n", " ") + ("..." if len(raw) > max_chars else ""))
+
+    # Image URLs are kept so later reports can still cite them
+    urls = list(dict.fromkeys(_S3_URL.findall(raw)))[:5]
+    if urls:
+        parts.append(f"images={' '.join(urls)}")
+    return " ".join(parts)
+
+
+class CompactingConversationManager(ConversationManager):
+    """Keeps the session history under a token budget
+
+    The last keep_recent_turns user turns stay verbatim. When the history exceeds
+    token_budget, tool results of older turns are replaced by one-line summaries
+    (status, counts, classes, S3 URLs); if that is not enough, the oldest turns are
+    dropped whole so toolUse/toolResult pairs stay intact. Older turns are only dropped
+    while that can bring the history under the budget; the recent turns themselves
+    are never dropped here.
+    """
+
+    def __init__(self, token_budget: int = 16000, keep_recent_turns: int = 2, max_summary_chars: int = 300):
+        super().__init__()
+        self.token_budget = token_budget
+        self.keep_recent_turns = keep_recent_turns
+        self.max_summary_chars = max_summary_chars
+
+    def _turn_starts(self, messages: List[dict]) -> List[int]:
+        """Indexes of user messages that start a turn (text, not tool results)"""
+        return [
+            index for index, message in enumerate(messages)
+            if message.get("role") == "user"
+            and not any("toolResult" in block for block in message.get("content") or [])
+        ]
+
+    def _compact_tool_results(self, messages: List[dict], end: int) -> int:
+        """Summarize tool results in messages[:end]; returns the number of results compacted"""
+        tool_names: Dict[str, str] = {}
+        compacted = 0
+        for message in messages[:end]:
+            for block in message.get("content") or []:
+                if "toolUse" in block:
+                    tool_names[block["toolUse"].get("toolUseId")] = block["toolUse"].get("name", "tool")
+                elif "toolResult" in block:
+                    tool_result = block["toolResult"]
+                    content = tool_result.get("content") or []
+                    if len(content) == 1 and content[0].get("text", "").startswith(COMPACTED_PREFIX):
+                        continue
+                    summary = summarize_tool_result(
+                        tool_names.get(tool_result.get("toolUseId"), "tool"), tool_result, self.max_summary_chars)
+                    block["toolResult"] = {**tool_result, "content": [{"text": summary}]}
+                    compacted += 1
+        return compacted
+
+    def _protected_start(self, turn_starts: List[int], message_count: int) -> int:
+        """Index of the first message of the last keep_recent_turns turns"""
+        if not self.keep_recent_turns:
+            return message_count
+        if len(turn_starts) <= self.keep_recent_turns:
+            return 0
+        return turn_starts[-self.keep_recent_turns]
+
+    def _drop_oldest_turn(self, agent: "Agent", min_turns: int) -> bool:
+        """Drop the oldest turn while more than min_turns turns remain"""
+        turn_starts = self._turn_starts(agent.messages)
+        if len(turn_starts) <= max(1, min_turns):
+            return False
+        # Everything before the second turn start, including any orphaned prefix
+        cut = turn_starts[1]
+        del agent.messages[:cut]
+        self.removed_message_count += cut
+        return True
+
+    def apply_management(self, agent: "Agent", **kwargs: Any) -> None:
+        """Compact the history after every agent invocation when it exceeds the token budget"""
+        before = estimate_tokens(agent.messages)
+        if before <= self.token_budget:
+            return
+
+        turn_starts = self._turn_starts(agent.messages)
+        protected_start = self._protected_start(turn_starts, len(agent.messages))
+        compacted = self._compact_tool_results(agent.messages, protected_start)
+
+        # When the recent turns alone exceed the budget, dropping the compacted summaries
+        # cannot reach it; keep them and let reduce_context handle a real overflow
+        dropped = 0
+        recent_tokens = estimate_tokens(agent.messages[protected_start:])
+        while (recent_tokens < self.token_budget
+               and estimate_tokens(agent.messages) > self.token_budget
+               and self._drop_oldest_turn(agent, self.keep_recent_turns)):
+            dropped += 1
+
+        logger.info(
+            f"History compaction: ~{before} -> ~{estimate_tokens(agent.messages)} tokens "
+            f"({compacted} tool results summarized, {dropped} turns dropped, {len(agent.messages)} messages)"
+        )
+
+    def reduce_context(self, agent: "Agent", e: Optional[Exception] = None, **kwargs: Any) -> None:
+        """Called when the model reports a context overflow: summarize everything but the
+        current turn and drop the oldest turn, down to the current one if needed"""
+        turn_starts = self._turn_starts(agent.messages)
+        compacted = self._compact_tool_results(agent.messages, turn_starts[-1]) if turn_starts else 0
+        dropped = self._drop_oldest_turn(agent, 1)
+        logger.info(f"Context overflow: {compacted} tool results summarized, oldest turn dropped: {dropped}")
+        if not compacted and not dropped:
+            raise ContextWindowOverflowException("History cannot be reduced further") from e
@@ -14,21 +14,23 @@ class MemoryHook(HookProvider):
         memory_id: str,
         actor_id: str,
         session_id: str,
+        preload_turns: int = 5,
     ):
         self.memory_client = memory_client
         self.memory_id = memory_id
         self.actor_id = actor_id
         self.session_id = session_id
+        self.preload_turns = preload_turns
 
     def on_agent_initialized(self, event: AgentInitializedEvent):
         """Load recent conversation history when agent starts"""
         try:
-            # Load the last 5 conversation turns from memory
+            # Load the last preload_turns conversation turns from memory
             recent_turns = self.memory_client.get_last_k_turns(
                 memory_id=self.memory_id,
                 actor_id=self.actor_id,
                 session_id=self.session_id,
-                k=5,
+                k=self.preload_turns,
             )
 
             if recent_turns:
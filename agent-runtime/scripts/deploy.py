@@ -1,4 +1,5 @@
 import os
+import shutil
 import time
 import json
 import boto3
@@ -42,6 +43,16 @@ def get_config_vars():
 
 
 
+def bundle_shared_modules():
+    """Copy lambda-common (robot_actions, sqs_forwarder) into agent-runtime/lambda_common for the image"""
+    runtime_dir = Path(__file__).resolve().parent.parent
+    target_dir = runtime_dir / 'lambda_common'
+    target_dir.mkdir(exist_ok=True)
+    for module in (runtime_dir.parent / 'lambda-common').glob('*.py'):
+        shutil.copy2(module, target_dir / module.name)
+    print(f"Shared modules copied to {target_dir}")
+
+
 def main():
     """Main deployment function"""
     print("Starting Strands Agent Runtime Deployment...")
@@ -74,6 +85,7 @@ def main():
     # Launch the runtime
     print("\n=== Launching Runtime ===")
     try:
+        bundle_shared_modules()
         launch_result = agentcore_runtime.launch(env_vars=config_vars)
         print("Runtime launch successful:")
         print(json.dumps(launch_result, indent=2, default=str))
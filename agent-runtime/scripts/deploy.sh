@@ -97,6 +97,14 @@ check_prerequisites() {
     print_success "All prerequisites met"
 }
 
+# Function to copy the shared lambda-common modules into the build context
+bundle_shared_modules() {
+    print_status "Bundling shared modules from ../lambda-common..."
+    mkdir -p lambda_common
+    cp ../lambda-common/*.py lambda_common/
+    print_success "Shared modules copied to lambda_common/"
+}
+
 # Function to configure the agent
 configure_agent() {
     print_status "Configuring Bedrock AgentCore Runtime..."
@@ -260,6 +268,9 @@ main() {
         configure_agent
     fi
     
+    # Bundle lambda-common (robot_actions, sqs_forwarder) into the image
+    bundle_shared_modules
+    
     # Launch the agent
     launch_agent
     
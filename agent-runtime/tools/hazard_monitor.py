@@ -0,0 +1,163 @@
+from strands import tool
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import copy
+import threading
+import time
+import logging
+from typing import Optional, Dict, Any, Callable
+from tools.robot_state import DEFAULT_ROBOT_ID, state_store, is_hazard
+
+logger = logging.getLogger(__name__)
+
+
+class HazardMonitor:
+    """Watches detections recorded by the state store and triggers a proactive response
+    only for new HIGH-risk hazards.
+
+    - Debounce: once a (robot, class) has been responded to, it does not trigger again
+      until it has not been detected for debounce_seconds, so a fire seen on every frame
+      triggers once.
+    - Rate limit: at most max_invocations responses per window_seconds; the rest are
+      recorded once as rate_limited and retried on later frames while the hazard persists.
+    - Responses run one at a time on a worker thread, never on the SQS consumer thread.
+    """
+
+    def __init__(self, responder: Callable[[Dict[str, Any]], Any], debounce_seconds: float = 120,
+                 max_invocations: int = 3, window_seconds: float = 600):
+        self.responder = responder
+        self.debounce_seconds = debounce_seconds
+        self.max_invocations = max_invocations
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._last_seen: Dict[tuple, float] = {}
+        # Keys responded to / waiting for capacity in the current detection episode
+        self._handled: set = set()
+        self._rate_limited: set = set()
+        self._invocations = deque()
+        self._events = deque(maxlen=50)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hazard-response")
+
+    def risk_level(self, result: dict) -> str:
+        """risk_level scored on the robot, or HIGH for the shared robot_state.is_hazard rule when missing."""
+        if result.get("risk_level"):
+            return result["risk_level"]
+        return "HIGH" if is_hazard(result) else "LOW"
+
+    def on_message(self, queue_name: str, message: Any) -> None:
+        """RobotStateStore listener."""
+        if queue_name != "robo_detection" or not isinstance(message, dict):
+            return
+
+        now = time.monotonic()
+        robot_id = message.get("robot_id") or DEFAULT_ROBOT_ID
+        new_hazards = []
+        new_keys = []
+
+        with self._lock:
+            for result in message.get("results") or []:
+                if not isinstance(result, dict) or self.risk_level(result) != "HIGH":
+                    continue
+                key = (robot_id, result.get("class"))
+                last_seen = self._last_seen.get(key)
+                self._last_seen[key] = now
+                if last_seen is None or now - last_seen >= self.debounce_seconds:
+                    # Not detected for debounce_seconds: a new episode of this hazard
+                    self._handled.discard(key)
+                    self._rate_limited.discard(key)
+                if key in self._handled or key in new_keys:
+                    continue
+                new_keys.append(key)
+                new_hazards.append(result)
+
+            if not new_hazards:
+                return
+
+            event = {
+                "robot_id": robot_id,
+                "hazards": new_hazards,
+                "filename": message.get("filename"),
+                "roi_filename": message.get("roi_filename"),
+                "detected_at": datetime.now().isoformat(),
+            }
+
+            while self._invocations and now - self._invocations[0] > self.window_seconds:
+                self._invocations.popleft()
+            if len(self._invocations) >= self.max_invocations:
+                # Not marked as handled, so a later frame triggers once there is capacity
+                if not set(new_keys) <= self._rate_limited:
+                    self._rate_limited.update(new_keys)
+                    event["status"] = "rate_limited"
+                    self._events.append(event)
+                    logger.warning(f"Hazard response rate limited: {robot_id} {[h.get('class') for h in new_hazards]}")
+                return
+
+            self._handled.update(new_keys)
+            self._rate_limited.difference_update(new_keys)
+            self._invocations.append(now)
+            event["status"] = "dispatched"
+            self._events.append(event)
+
+        logger.info(f"New HIGH-risk hazard on {robot_id}: {[h.get('class') for h in new_hazards]}")
+        self._executor.submit(self._respond, event)
+
+    def _respond(self, event: Dict[str, Any]) -> None:
+        start = time.monotonic()
+        try:
+            response = self.responder(event)
+            with self._lock:
+                event["status"] = "responded"
+                event["response"] = str(response)
+        except Exception as e:
+            logger.error(f"Hazard response failed: {e}", exc_info=True)
+            with self._lock:
+                event["status"] = "failed"
+                event["error"] = str(e)
+        with self._lock:
+            event["response_seconds"] = round(time.monotonic() - start, 2)
+
+    def recent_events(self, limit: int = 10) -> list:
+        with self._lock:
+            return copy.deepcopy(list(self._events)[-limit:])
+
+
+hazard_monitor: Optional[HazardMonitor] = None
+
+
+def start_hazard_monitor(responder: Callable[[Dict[str, Any]], Any], settings: Optional[dict] = None) -> HazardMonitor:
+    """Register the hazard monitor on the state store (the state consumer must be running)."""
+    global hazard_monitor
+    if hazard_monitor is None:
+        hazard_monitor = HazardMonitor(responder, **(settings or {}))
+        state_store.add_listener(hazard_monitor.on_message)
+        logger.info("Hazard monitor started")
+    return hazard_monitor
+
+
+@tool
+def get_hazard_alerts(limit: int = 10):
+    """Get the HIGH-risk hazards the robot detected in the background and how they were handled.
+    New hazards are answered automatically (robot warning + summary) without a user request;
+    check this when the user asks whether anything dangerous happened.
+
+    Args:
+        limit: Maximum number of recent alerts to return (default 10)
+
+    Returns:
+        Recent alerts with robot_id, hazards, image paths, status
+        (dispatched, responded, failed, rate_limited) and the automatic response.
+    """
+    if hazard_monitor is None:
+        return {
+            "status": "unavailable",
+            "message": "Hazard monitor is not running. Use get_robot_detection instead.",
+            "timestamp": datetime.now().isoformat()
+        }
+    alerts = hazard_monitor.recent_events(max(1, min(int(limit), 50)))
+    return {
+        "status": "success" if alerts else "no_alerts",
+        "alert_count": len(alerts),
+        "timestamp": datetime.now().isoformat(),
+        "alerts": alerts
+    }
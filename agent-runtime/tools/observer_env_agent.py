@@ -1,41 +1,198 @@
 from strands import Agent, tool
-from tools.robot_tools import get_robot_feedback, get_robot_detection, get_robot_gesture, analyze_robot_image
-from prompts.prompt import ORCHESTRATOR_PROMPT
+from strands.models import BedrockModel
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import time
+import logging
+from typing import Optional, Dict, Any
+from tools.robot_tools import get_robot_feedback, get_robot_detection, get_robot_gesture
+from tools.robot_state import is_hazard
+from utils.shared import sqs_forwarder
+from prompts.prompt import OBSERVER_PROMPT, OBSERVATION_TEMPLATE
 from config.config import Config
 
+logger = logging.getLogger(__name__)
+
+
+# 관찰에 필요한 데이터 수집 도구 (동시에 실행)
+OBSERVATION_SOURCES = {
+    "feedback": get_robot_feedback,
+    "detection": get_robot_detection,
+    "gesture": get_robot_gesture,
+}
+
+# 빠른 관찰 모드에서 템플릿만으로 보고하는 제스처는 제스처 파이프라인의 라벨(sqs_forwarder.GESTURE_LABELS),
+# 그 외 라벨은 LLM 요약. 보고에 쓰는 한국어 설명 (없으면 라벨 그대로)
+GESTURE_DESCRIPTIONS = {
+    "wave": "손 흔들기",
+    "help": "도움 요청",
+    "ok": "이상 없음 신호",
+    "stop": "정지 요청",
+}
+OBSERVATION_MODES = ("fast", "agent")
+
+_observer_agent: Optional[Agent] = None
+# Agent는 동시 호출을 지원하지 않으므로 관찰은 한 번에 하나씩 실행
+_observer_lock = threading.Lock()
+
+# 모드별 최근 관찰 소요 시간 (초)
+_latencies = {mode: deque(maxlen=50) for mode in OBSERVATION_MODES}
+_latency_lock = threading.Lock()
+
+
+def gather_observations() -> Dict[str, Any]:
+    """피드백, 감지, 제스처 데이터를 동시에 수집합니다 (가장 느린 큐의 대기 시간만 소요)."""
+    with ThreadPoolExecutor(max_workers=len(OBSERVATION_SOURCES), thread_name_prefix="observe") as executor:
+        futures = {name: executor.submit(source) for name, source in OBSERVATION_SOURCES.items()}
+        observations = {}
+        for name, future in futures.items():
+            try:
+                observations[name] = future.result()
+            except Exception as e:
+                observations[name] = {"error": str(e)}
+        return observations
+
+
+def _get_observer_agent() -> Agent:
+    """관찰 전용 Agent를 한 번만 생성하여 재사용합니다 (도구 없이 수집된 데이터만 요약)."""
+    global _observer_agent
+    if _observer_agent is None:
+        config = Config.from_config_file()
+        _observer_agent = Agent(
+            model=BedrockModel(model_id=config.model_id),
+            tools=[],
+            system_prompt=OBSERVER_PROMPT,
+            callback_handler=None
+        )
+    return _observer_agent
+
+
+def _messages(result: Any) -> list:
+    if isinstance(result, dict) and result.get("status") == "success":
+        return [message for message in result.get("messages") or [] if isinstance(message, dict)]
+    return []
+
+
+def _status_line(result: Any) -> Optional[str]:
+    """메시지가 없거나 오류인 경우의 한 줄 요약"""
+    if isinstance(result, dict) and "error" in result:
+        return f"- 조회 실패: {result['error']}"
+    if not _messages(result):
+        return "- 새 데이터 없음"
+    return None
+
+
+def format_observation(observations: Dict[str, Any]) -> tuple:
+    """수집된 데이터를 템플릿으로 정리합니다.
+
+    Returns:
+        (보고 텍스트, LLM 요약이 필요한 이유 목록) - 위험 감지나 알 수 없는 제스처가 있으면 이유가 채워짐
+    """
+    reasons = []
+    sections = []
+
+    lines = []
+    for message in _messages(observations.get("feedback")):
+        details = ", ".join(
+            f"{key}: {message[key]}" for key in ("status", "message", "action", "position", "battery")
+            if message.get(key) is not None
+        )
+        lines.append(f"- [{message.get('robot_id', '-')}] {details or json.dumps(message, ensure_ascii=False)}")
+    sections.append("[피드백]\n" + "\n".join(lines or [_status_line(observations.get("feedback"))]))
+
+    lines = []
+    for message in _messages(observations.get("detection")):
+        for result in message.get("results") or []:
+            if not isinstance(result, dict):
+                continue
+            hazard = is_hazard(result)
+            if hazard:
+                reasons.append(f"위험 감지: {result.get('class')}")
+            lines.append(
+                f"- {'⚠️ ' if hazard else ''}{result.get('class')} "
+                f"(신뢰도 {result.get('confidence')}, 위험도 {result.get('risk_level') or ('HIGH' if hazard else 'LOW')})"
+            )
+        image = message.get("roi_filename") or message.get("filename")
+        if image:
+            lines.append(f"  이미지: {image}")
+    sections.append("[감지]\n" + "\n".join(lines or [_status_line(observations.get("detection")) or "- 감지된 객체 없음"]))
+
+    lines = []
+    for message in _messages(observations.get("gesture")):
+        gesture = message.get(sqs_forwarder.GESTURE_LABEL_FIELD)
+        if gesture is None:
+            # 라벨이 없는 메시지는 인식된 제스처 없음
+            continue
+        if gesture in sqs_forwarder.GESTURE_LABELS:
+            description = GESTURE_DESCRIPTIONS.get(gesture, gesture)
+            lines.append(f"- {gesture} ({description}, 신뢰도 {message.get('confidence')})")
+        else:
+            reasons.append(f"알 수 없는 제스처: {gesture}")
+            lines.append(f"- {gesture} (알 수 없는 제스처, 신뢰도 {message.get('confidence')})")
+        if message.get("filename"):
+            lines.append(f"  이미지: {message['filename']}")
+    sections.append("[제스처]\n" + "\n".join(lines or [_status_line(observations.get("gesture")) or "- 인식된 제스처 없음"]))
+
+    return "\n\n".join(sections), reasons
+
+
+def _summarize(observations: Dict[str, Any]) -> str:
+    """캐시된 관찰 Agent로 한 번의 모델 호출로 요약합니다."""
+    prompt = OBSERVATION_TEMPLATE.format(**{
+        name: json.dumps(result, ensure_ascii=False, default=str)
+        for name, result in observations.items()
+    })
+    with _observer_lock:
+        agent = _get_observer_agent()
+        # 호출마다 새 대화로 시작 (이전 관찰 내용을 다시 보내지 않음)
+        agent.messages = []
+        return str(agent(prompt))
+
+
+def _latency_report(mode: str, elapsed: float) -> str:
+    """이번 관찰 시간과 다른 모드의 최근 평균을 비교한 한 줄"""
+    with _latency_lock:
+        _latencies[mode].append(elapsed)
+        other = "agent" if mode == "fast" else "fast"
+        history = list(_latencies[other])
+    comparison = (
+        f"{other} 경로 최근 {len(history)}회 평균 {sum(history) / len(history):.2f}초"
+        if history else f"{other} 경로 측정 기록 없음"
+    )
+    return f"[관찰 시간] {mode} 경로 {elapsed:.2f}초 ({comparison})"
+
 
 @tool
-def observe_env_agent() -> str:
-    """현재 로봇의 상태 정보를 수집하고, 필요시에만 이미지를 분석합니다.
-    
-    이 Agent는 로봇의 feedback 정보를 확인하고, 필요하다면 detection과 gesture 데이터를 확인합니다.
-    
+def observe_env_agent(mode: str = "fast") -> str:
+    """현재 로봇의 상태 정보를 수집하고 요약합니다.
+
+    로봇의 feedback, detection, gesture 데이터를 동시에 수집합니다.
+    - fast (기본값): 템플릿으로 바로 보고하고, 위험 감지나 알 수 없는 제스처가 있을 때만 LLM 요약을 추가
+    - agent: 항상 한 번의 모델 호출로 상황을 요약
+
     Args:
-        None
+        mode: "fast" 또는 "agent"
 
     Returns:
-        로봇 상태 정보와 환경 관찰 데이터 (필요시 이미지 분석 포함)
+        로봇 상태 정보와 환경 관찰 데이터, 관찰 소요 시간
     """
+    if mode not in OBSERVATION_MODES:
+        return f"Error in observe_env: unknown mode {mode}. Supported modes: {', '.join(OBSERVATION_MODES)}"
+
     try:
-        # Config에서 모델 ID 로드
-        config = Config.from_config_file()
-        
-        # Agent 생성 - 필요한 도구들을 포함
-        agent = Agent(
-            model=config.model_id,
-            tools=[
-                get_robot_feedback,
-                get_robot_detection,
-                get_robot_gesture,
-                # analyze_robot_image
-            ],
-            system_prompt=ORCHESTRATOR_PROMPT
-        )
+        start = time.monotonic()
+        observations = gather_observations()
+
+        if mode == "agent":
+            report = _summarize(observations)
+        else:
+            report, reasons = format_observation(observations)
+            if reasons:
+                logger.info(f"Observation needs an LLM summary: {reasons}")
+                report += "\n\n[요약]\n" + _summarize(observations)
 
-        # Agent에게 현재 상황을 분석하도록 요청
-        response = agent("현재 로봇의 상태를 확인하세요.")
-        
-        
-        return response
+        return report + "\n\n" + _latency_report(mode, time.monotonic() - start)
     except Exception as e:
         return f"Error in observe_env: {str(e)}"
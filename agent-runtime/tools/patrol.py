@@ -0,0 +1,156 @@
+from strands import tool
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import time
+import logging
+from typing import Optional, Dict, Any, List
+from tools.robot_tools import get_robot_feedback, get_robot_detection, get_robot_gesture, await_command_result
+from tools.robot_command import send_command
+from tools.robot_state import is_hazard
+
+logger = logging.getLogger(__name__)
+
+
+# The patrol scenario of ORCHESTRATOR_PROMPT: detect at point 1, check gestures at point 2, return
+DEFAULT_PATROL_ROUTE = [
+    {"action": "from0to1", "message": "포인트 1로 이동합니다", "observe": ["detection"]},
+    {"action": "from1to2", "message": "포인트 2로 이동합니다", "observe": ["gesture", "feedback"]},
+    {"action": "from2to0", "message": "복귀합니다", "observe": []},
+]
+OBSERVATION_SOURCES = {
+    "detection": get_robot_detection,
+    "gesture": get_robot_gesture,
+    "feedback": get_robot_feedback,
+}
+MAX_PATROL_STEPS = 10
+
+
+def _validate_route(route: List[dict]) -> Optional[str]:
+    if not isinstance(route, list) or not route:
+        return "route must be a non-empty list of steps"
+    if len(route) > MAX_PATROL_STEPS:
+        return f"Too many steps: {len(route)} (max {MAX_PATROL_STEPS})"
+    for index, step in enumerate(route):
+        if not isinstance(step, dict) or not step.get("action"):
+            return f"Step {index} must be an object with action, message and observe"
+        unknown = set(step.get("observe") or []) - set(OBSERVATION_SOURCES)
+        if unknown:
+            return f"Step {index} has unknown observations: {', '.join(sorted(unknown))}"
+    return None
+
+
+def _observe(names: List[str]) -> Dict[str, Any]:
+    """Collect the requested queues concurrently (bounded by the slowest queue)."""
+    if not names:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="patrol-observe") as executor:
+        futures = {name: executor.submit(OBSERVATION_SOURCES[name]) for name in names}
+        observations = {}
+        for name, future in futures.items():
+            try:
+                observations[name] = future.result()
+            except Exception as e:
+                observations[name] = {"error": str(e)}
+        return observations
+
+
+def _collect_findings(step_index: int, observations: Dict[str, Any], hazards: list, images: list) -> None:
+    for name, result in observations.items():
+        if not isinstance(result, dict) or result.get("status") != "success":
+            continue
+        for message in result.get("messages") or []:
+            if not isinstance(message, dict):
+                continue
+            for key in ("filename", "roi_filename"):
+                if message.get(key) and message[key] not in images:
+                    images.append(message[key])
+            if name != "detection":
+                continue
+            for detection in message.get("results") or []:
+                if isinstance(detection, dict) and is_hazard(detection):
+                    hazards.append({
+                        "step": step_index,
+                        "class": detection.get("class"),
+                        "confidence": detection.get("confidence"),
+                        "risk_level": detection.get("risk_level"),
+                        "filename": message.get("roi_filename") or message.get("filename"),
+                    })
+
+
+@tool
+def run_patrol(route: Optional[List[dict]] = None, timeout: int = 30):
+    """Run a whole patrol in one call: move, wait for arrival, collect observations at each point.
+    Use this for "순찰해줘" / "위험 상황 감지해줘" requests instead of issuing command,
+    await_command_result and get_robot_* calls one by one, then write the report from the result.
+
+    Args:
+        route: Optional list of steps {"action": move, "message": voice message, "observe": ["detection", "gesture", "feedback"]}.
+            Omit to run the standard patrol (0→1 detection, 1→2 gesture, 2→0 return).
+        timeout: Seconds to wait for the arrival feedback of each move (5-120, default 30)
+
+    Returns:
+        One patrol record: per-step arrival status and observations, HIGH/MEDIUM hazards,
+        every image S3 URL and the elapsed time. status is "completed" or "aborted" (a move
+        command failed; the remaining steps were skipped). A step whose arrival was not reported
+        falls back to get_robot_feedback (arrival "feedback"); when that is empty too, the step
+        is still observed and marked "arrival_unconfirmed" (counted in steps_unconfirmed).
+    """
+    route = route or DEFAULT_PATROL_ROUTE
+    error = _validate_route(route)
+    if error:
+        return {"error": error}
+    timeout = max(5, min(int(timeout), 120))
+
+    start = time.monotonic()
+    steps, hazards, images = [], [], []
+    status = "completed"
+
+    for index, step in enumerate(route):
+        step_start = time.monotonic()
+        record = {"step": index, "action": step["action"]}
+        steps.append(record)
+
+        command = send_command(step["action"], step.get("message"))
+        if "error" in command:
+            record.update({"status": "command_failed", "error": command["error"]})
+            status = "aborted"
+            break
+
+        arrival = await_command_result(command.get("correlation_id"), timeout) if command.get("correlation_id") else {
+            "status": "error", "message": "Command returned no correlation_id"}
+        record["arrival"] = arrival.get("status")
+        step_status = "done"
+        if arrival.get("status") == "success":
+            record["feedback"] = arrival.get("message")
+        else:
+            # Same fallback as the prompt flow: check the robot feedback once more, and
+            # observe this point anyway when the arrival still cannot be confirmed
+            logger.info(f"Patrol step {index} ({step['action']}) arrival {arrival.get('status')}, checking feedback")
+            feedback = get_robot_feedback()
+            messages = feedback.get("messages") if isinstance(feedback, dict) else None
+            if messages:
+                record.update({"arrival": "feedback", "feedback": messages[-1]})
+            else:
+                step_status = "arrival_unconfirmed"
+                record["error"] = arrival.get("message") or arrival.get("error")
+
+        observations = _observe(step.get("observe") or [])
+        _collect_findings(index, observations, hazards, images)
+        record.update({
+            "status": step_status,
+            "observations": observations,
+            "elapsed_seconds": round(time.monotonic() - step_start, 2),
+        })
+        logger.info(f"Patrol step {index} ({step['action']}) done in {record['elapsed_seconds']}s")
+
+    return {
+        "status": status,
+        "steps_completed": sum(1 for record in steps if record.get("status") == "done"),
+        "steps_unconfirmed": sum(1 for record in steps if record.get("status") == "arrival_unconfirmed"),
+        "steps_total": len(route),
+        "elapsed_seconds": round(time.monotonic() - start, 2),
+        "hazards": hazards,
+        "images": images,
+        "steps": steps,
+        "timestamp": datetime.now().isoformat()
+    }
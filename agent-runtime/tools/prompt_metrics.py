@@ -0,0 +1,109 @@
+from strands import tool
+from datetime import datetime
+import json
+import boto3
+import re
+import logging
+from typing import Optional, Dict, Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+# CountTokens takes the foundation model ID, not the cross-region inference profile
+_INFERENCE_PROFILE_PREFIX = re.compile(r'^(us|eu|apac|us-gov|global)\.')
+# Rough characters per token for mixed Korean/English text when CountTokens is unavailable
+ESTIMATED_CHARS_PER_TOKEN = 2.5
+
+# Set by AgentManager when the orchestrator agent is created
+_prompt_source: Optional[Callable[[], Dict[str, Any]]] = None
+
+
+def set_prompt_source(model_id: str, system_prompt: str, tool_specs: Callable[[], List[dict]]) -> None:
+    """Register the prompt and the tool specs (called lazily) that measure_prompt_tokens reports on."""
+    global _prompt_source
+    _prompt_source = lambda: {
+        "model_id": model_id,
+        "system_prompt": system_prompt,
+        "tool_specs": tool_specs(),
+    }
+
+
+def _count_tokens(bedrock, model_id: str, system_prompt: Optional[str] = None,
+                  tool_specs: Optional[List[dict]] = None) -> int:
+    converse = {"messages": [{"role": "user", "content": [{"text": "."}]}]}
+    if system_prompt:
+        converse["system"] = [{"text": system_prompt}]
+    if tool_specs:
+        converse["toolConfig"] = {"tools": [{"toolSpec": spec} for spec in tool_specs]}
+    response = bedrock.count_tokens(
+        modelId=_INFERENCE_PROFILE_PREFIX.sub('', model_id),
+        input={"converse": converse}
+    )
+    return response["inputTokens"]
+
+
+def count_prompt_tokens(model_id: str, system_prompt: str, tool_specs: List[dict],
+                        region: str = "us-west-2") -> Dict[str, Any]:
+    """Input tokens taken by the system prompt and the tool schemas on every model turn.
+
+    Uses the Bedrock CountTokens API (the one-character user message is subtracted) and falls
+    back to a character-based estimate when the model does not support it.
+    """
+    try:
+        bedrock = boto3.client('bedrock-runtime', region_name=region)
+        baseline = _count_tokens(bedrock, model_id)
+        system_tokens = _count_tokens(bedrock, model_id, system_prompt=system_prompt) - baseline
+        tool_tokens = _count_tokens(bedrock, model_id, tool_specs=tool_specs) - baseline
+        method = "count_tokens"
+    except Exception as e:
+        logger.warning(f"CountTokens unavailable for {model_id}, estimating: {e}")
+        system_tokens = round(len(system_prompt) / ESTIMATED_CHARS_PER_TOKEN)
+        tool_tokens = round(len(json.dumps(tool_specs, ensure_ascii=False)) / ESTIMATED_CHARS_PER_TOKEN)
+        method = "estimate"
+
+    per_tool = sorted(
+        ({
+            "name": spec.get("name"),
+            "estimated_tokens": round(len(json.dumps(spec, ensure_ascii=False)) / ESTIMATED_CHARS_PER_TOKEN),
+        } for spec in tool_specs),
+        key=lambda item: item["estimated_tokens"],
+        reverse=True
+    )
+    return {
+        "model_id": model_id,
+        "method": method,
+        "system_prompt_tokens": system_tokens,
+        "system_prompt_chars": len(system_prompt),
+        "tool_count": len(tool_specs),
+        "tool_schema_tokens": tool_tokens,
+        "total_tokens": system_tokens + tool_tokens,
+        "largest_tools": per_tool[:5],
+    }
+
+
+@tool
+def measure_prompt_tokens():
+    """Measure how many input tokens the system prompt and the tool schemas take on every model turn.
+    Use this only when the user asks about prompt size or token cost.
+
+    Returns:
+        Token counts of the system prompt and the tool schemas, their total and the largest tool schemas.
+        These tokens are written to the prompt cache on the first turn and read from it afterwards.
+    """
+    if _prompt_source is None:
+        return {
+            "status": "unavailable",
+            "message": "Agent is not initialized yet",
+            "timestamp": datetime.now().isoformat()
+        }
+    try:
+        source = _prompt_source()
+        result = count_prompt_tokens(source["model_id"], source["system_prompt"], source["tool_specs"])
+        result["status"] = "success"
+        result["timestamp"] = datetime.now().isoformat()
+        return result
+    except Exception as e:
+        return {
+            "error": f"Unexpected error in measure_prompt_tokens: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }
@@ -0,0 +1,284 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+import copy
+import json
+import os
+import random
+import threading
+import time
+import logging
+from typing import Optional, Dict, Any, Callable, List
+from utils.shared import sqs_forwarder
+
+logger = logging.getLogger(__name__)
+
+
+# Queues served by every backend
+ROBOT_QUEUES = ("robo_feedback", "robo_detection", "robo_gesture")
+
+
+def success_result(messages: list, timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+    """Result shape returned by the get_robot_* tools when messages were received."""
+    return {
+        "status": "success",
+        "message_count": len(messages),
+        "timestamp": (timestamp or datetime.now()).isoformat(),
+        "messages": messages
+    }
+
+
+def no_messages_result(queue_name: str, timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+    return {
+        "status": "no_messages",
+        "message": f"No messages available in the {queue_name} queue",
+        "timestamp": (timestamp or datetime.now()).isoformat()
+    }
+
+
+def robot_filter(robot_id: Optional[str]) -> Callable[[Any], bool]:
+    """Predicate for message bodies of the given robot (every message when robot_id is None)."""
+    return lambda message_body: not robot_id or (
+        isinstance(message_body, dict) and message_body.get("robot_id") == robot_id)
+
+
+class RobotBackend(ABC):
+    """Source of robot messages for the robot tools.
+
+    get_messages follows the SQS tool semantics: only messages that arrive after the
+    call, waiting at most timeout seconds. await_feedback returns the robo_feedback
+    message for a command's correlation_id, or None after timeout seconds.
+    """
+    name = "base"
+
+    @abstractmethod
+    def get_messages(self, queue_name: str, robot_id: Optional[str] = None, timeout: float = 5) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def await_feedback(self, correlation_id: str, timeout: float) -> Optional[dict]:
+        ...
+
+    def receive(self, queue_name: str, timeout: float = 20) -> List[dict]:
+        """Next messages of the queue for the background state consumer (every robot)."""
+        return self.get_messages(queue_name, None, timeout).get("messages") or []
+
+
+class SimulatorBackend(RobotBackend):
+    """In-memory robot that generates messages at configurable rates and payload sizes.
+
+    Message contents, timestamps and timings come from a seeded RNG and a simulated
+    clock, so runs are reproducible. time_scale=0 disables sleeping for load tests.
+    """
+    name = "simulator"
+
+    DETECTION_CLASSES = ("fire", "explosion", "person_down", "emergency_situation", "steam", "person")
+    GESTURES = sqs_forwarder.GESTURE_LABELS
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, results_per_message: int = 1,
+                 payload_bytes: int = 0, command_latency: float = 2.0, time_scale: float = 1.0,
+                 seed: int = 0, robot_id: str = "robo-sim-001", start_timestamp: int = 1760000000):
+        # Messages per second for each queue (0 = the queue stays silent)
+        self.rates = {"robo_feedback": 1.0, "robo_detection": 1.0, "robo_gesture": 0.5}
+        self.rates.update(rates or {})
+        self.results_per_message = results_per_message
+        self.payload_bytes = payload_bytes
+        self.command_latency = command_latency
+        self.time_scale = time_scale
+        self.robot_id = robot_id
+        self.start_timestamp = start_timestamp
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def _sleep(self, seconds: float) -> None:
+        if self.time_scale > 0 and seconds > 0:
+            time.sleep(seconds * self.time_scale)
+
+    def _pad(self, message: dict) -> dict:
+        """Grow the message to payload_bytes of JSON (when larger than the natural size)."""
+        missing = self.payload_bytes - len(json.dumps(message, separators=(',', ':')))
+        if missing > 14:
+            message["padding"] = "x" * (missing - 14)
+        return message
+
+    def _make_message(self, queue_name: str) -> dict:
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            rng = self._rng
+            timestamp = self.start_timestamp + seq
+            message = {"robot_id": self.robot_id, "timestamp": timestamp, "message_id": f"sim-{seq}"}
+
+            if queue_name == "robo_detection":
+                results = []
+                for _ in range(self.results_per_message):
+                    x1, y1 = rng.randint(0, 960), rng.randint(0, 540)
+                    results.append({
+                        "class": rng.choice(self.DETECTION_CLASSES),
+                        "confidence": round(rng.uniform(0.3, 0.99), 2),
+                        "position": [x1, y1, x1 + rng.randint(40, 320), y1 + rng.randint(40, 320)],
+                        "risk_level": rng.choice(("LOW", "MEDIUM", "HIGH")),
+                    })
+                message.update({
+                    "filename": f"s3://robo-simulator/detected/{timestamp}-frame_{seq:05d}.jpg",
+                    "results": results,
+                })
+            elif queue_name == "robo_gesture":
+                message.update({
+                    sqs_forwarder.GESTURE_LABEL_FIELD: rng.choice(self.GESTURES),
+                    "confidence": round(rng.uniform(0.5, 0.99), 2),
+                    "filename": f"s3://robo-simulator/gestures/{timestamp}-frame_{seq:05d}.jpg",
+                })
+            else:
+                message.update({"status": "success", "message": "simulated feedback"})
+        return self._pad(message)
+
+    def get_messages(self, queue_name: str, robot_id: Optional[str] = None, timeout: float = 5) -> Dict[str, Any]:
+        current_time = datetime.now()
+        rate = self.rates.get(queue_name, 0)
+        if rate <= 0 or (robot_id and robot_id != self.robot_id) or 1.0 / rate > timeout:
+            self._sleep(timeout)
+            return no_messages_result(queue_name, current_time)
+
+        # The first batch arrives after one message interval, up to 3 messages like the SQS path
+        self._sleep(1.0 / rate)
+        count = min(3, max(1, int(rate)))
+        return success_result([self._make_message(queue_name) for _ in range(count)], current_time)
+
+    def await_feedback(self, correlation_id: str, timeout: float) -> Optional[dict]:
+        # The simulated robot completes every command after command_latency seconds
+        if self.command_latency > timeout:
+            self._sleep(timeout)
+            return None
+        self._sleep(self.command_latency)
+        message = self._make_message("robo_feedback")
+        message["correlation_id"] = correlation_id
+        return message
+
+
+class ReplayBackend(RobotBackend):
+    """Replays messages recorded to a JSONL file by RecordingBackend.
+
+    Each line is {"queue": ..., "offset": seconds since recording start, "message": {...}}.
+    realtime=True reproduces the recorded gaps between messages of a queue.
+    """
+    name = "replay"
+
+    def __init__(self, path: str, realtime: bool = False, loop: bool = False):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self._lock = threading.Lock()
+        self._records: Dict[str, List[dict]] = {queue_name: [] for queue_name in ROBOT_QUEUES}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._records.setdefault(record["queue"], []).append(record)
+        self._positions = {queue_name: 0 for queue_name in self._records}
+        # Monotonic time at which the last replayed message of each queue was due
+        self._due: Dict[str, float] = {}
+        logger.info(f"Replay backend loaded {sum(len(r) for r in self._records.values())} messages from {path}")
+
+    def _next(self, queue_name: str, predicate: Callable[[Any], bool], timeout: float) -> Optional[dict]:
+        """Next recorded message of the queue that matches predicate (scans at most one pass).
+
+        The record and its due time are taken under the lock; the realtime wait happens
+        outside it so readers of other queues are never blocked.
+        """
+        records = self._records.get(queue_name, [])
+        deadline = time.monotonic() + timeout
+        for _ in range(len(records)):
+            with self._lock:
+                position = self._positions[queue_name]
+                if position >= len(records):
+                    if not self.loop:
+                        return None
+                    position = 0
+                record = records[position]
+                now = time.monotonic()
+                due = now
+                if self.realtime and position > 0:
+                    gap = max(0.0, record["offset"] - records[position - 1]["offset"])
+                    due = max(now, self._due.get(queue_name, now) + gap)
+                    if due > deadline:
+                        return None
+                self._positions[queue_name] = position + 1
+                self._due[queue_name] = due
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if predicate(record["message"]):
+                return copy.deepcopy(record["message"])
+        return None
+
+    def get_messages(self, queue_name: str, robot_id: Optional[str] = None, timeout: float = 5) -> Dict[str, Any]:
+        current_time = datetime.now()
+        message = self._next(queue_name, robot_filter(robot_id), timeout)
+        if message is None:
+            return no_messages_result(queue_name, current_time)
+        return success_result([message], current_time)
+
+    def await_feedback(self, correlation_id: str, timeout: float) -> Optional[dict]:
+        # Correlation IDs are random per run, so the next recorded feedback stands in for the command result
+        message = self._next("robo_feedback", lambda message_body: True, timeout)
+        if message is not None:
+            message["correlation_id"] = correlation_id
+        return message
+
+
+class RecordingBackend(RobotBackend):
+    """Wraps another backend and appends every message it returns to a JSONL file."""
+
+    def __init__(self, backend: RobotBackend, path: str):
+        self.backend = backend
+        self.name = f"{backend.name}+record"
+        self.path = path
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _record(self, queue_name: str, messages: list) -> None:
+        offset = round(time.monotonic() - self._start, 3)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            for message in messages:
+                f.write(json.dumps({"queue": queue_name, "offset": offset, "message": message},
+                                   ensure_ascii=False) + "\n")
+
+    def get_messages(self, queue_name: str, robot_id: Optional[str] = None, timeout: float = 5) -> Dict[str, Any]:
+        result = self.backend.get_messages(queue_name, robot_id, timeout)
+        if result.get("messages"):
+            self._record(queue_name, result["messages"])
+        return result
+
+    def await_feedback(self, correlation_id: str, timeout: float) -> Optional[dict]:
+        message = self.backend.await_feedback(correlation_id, timeout)
+        if message is not None:
+            self._record("robo_feedback", [message])
+        return message
+
+
+def create_backend(settings: Optional[dict], sqs_backend_factory: Callable[[], RobotBackend]) -> RobotBackend:
+    """Build the backend described by config.json "robot_backend".
+
+    {"type": "sqs" | "simulator" | "replay", "record_path": "recordings/patrol.jsonl", ...}
+    Remaining keys are passed to the simulator (rates, results_per_message, payload_bytes,
+    command_latency, time_scale, seed) or the replay backend (path, realtime, loop).
+    """
+    settings = dict(settings or {})
+    backend_type = settings.pop("type", "sqs")
+    record_path = settings.pop("record_path", None)
+
+    if backend_type == "sqs":
+        backend = sqs_backend_factory()
+    elif backend_type == "simulator":
+        backend = SimulatorBackend(**settings)
+    elif backend_type == "replay":
+        backend = ReplayBackend(**settings)
+    else:
+        raise ValueError(f"Unknown robot backend: {backend_type}. Supported backends: sqs, simulator, replay")
+
+    if record_path:
+        backend = RecordingBackend(backend, record_path)
+    logger.info(f"Robot backend: {backend.name}")
+    return backend
@@ -0,0 +1,62 @@
+from datetime import datetime
+import json
+import uuid
+import logging
+from typing import Optional, Dict, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+# Set by AgentManager once the AgentCore Gateway tools are loaded
+_command_sender: Optional[Callable[[str, Optional[str]], Dict[str, Any]]] = None
+
+
+def set_command_sender(sender: Optional[Callable[[str, Optional[str]], Dict[str, Any]]]) -> None:
+    """Register how local code (patrol, intent router) sends robot commands without a model turn."""
+    global _command_sender
+    _command_sender = sender
+
+
+def mcp_command_sender(mcp_client: Any, tool_name: str) -> Callable[[str, Optional[str]], Dict[str, Any]]:
+    """Sender that calls the Gateway command tool (the MCP interface Lambda) directly."""
+    def send(action: str, message: Optional[str] = None) -> Dict[str, Any]:
+        arguments = {"action": action}
+        if message:
+            arguments["message"] = message
+        result = mcp_client.call_tool_sync(f"local-{uuid.uuid4().hex}", tool_name, arguments)
+
+        text = "".join(block.get("text", "") for block in result.get("content", []) if isinstance(block, dict))
+        try:
+            response = json.loads(text)
+        except json.JSONDecodeError:
+            response = {"body": text}
+
+        if result.get("status") != "success" or response.get("statusCode", 200) != 200:
+            return {"error": f"Command {action} failed: {response.get('body', text)}"}
+        body = response.get("body")
+        return {
+            "status": "success",
+            "action": action,
+            "correlation_id": body.get("correlation_id") if isinstance(body, dict) else None,
+        }
+    return send
+
+
+def local_command_sender(action: str, message: Optional[str] = None) -> Dict[str, Any]:
+    """Sender for debug runs against the simulator/replay backends (nothing is published)."""
+    logger.info(f"Local command (not published): {action} {message or ''}")
+    return {"status": "success", "action": action, "correlation_id": uuid.uuid4().hex, "simulated": True}
+
+
+def send_command(action: str, message: Optional[str] = None) -> Dict[str, Any]:
+    """Send a robot command through the registered sender; returns the correlation_id or an error."""
+    if _command_sender is None:
+        return {
+            "error": "Robot commands are not available (agent is not initialized)",
+            "timestamp": datetime.now().isoformat()
+        }
+    try:
+        return _command_sender(action, message)
+    except Exception as e:
+        logger.error(f"Error sending command {action}: {e}")
+        return {"error": f"Error sending command {action}: {str(e)}"}
@@ -0,0 +1,324 @@
+from strands import tool
+from collections import deque
+from datetime import datetime
+import json
+import copy
+import threading
+import time
+import logging
+from typing import Optional, Dict, Any, Callable, List
+from utils.sqs_util import decode_message_body
+from tools.robot_backend import RobotBackend
+
+logger = logging.getLogger(__name__)
+
+
+# Queues consumed by the background state consumer
+STATE_QUEUES = ("robo_feedback", "robo_detection", "robo_gesture")
+DEFAULT_ROBOT_ID = "default"
+
+# Feedback fields copied into the robot snapshot (the robot firmware defines the payload)
+POSITION_FIELDS = ("position", "location", "pose")
+ACTION_FIELDS = ("action", "move", "last_action")
+HAZARD_CLASSES = {"fire", "explosion", "person_down", "emergency_situation", "steam"}
+
+
+def is_hazard(result: dict) -> bool:
+    """Detection result that should be remembered as a hazard (risk scored on the robot when available)."""
+    risk_level = result.get("risk_level")
+    if risk_level:
+        return risk_level != "LOW"
+    return result.get("class") in HAZARD_CLASSES
+
+
+class RobotStateStore:
+    """Latest robot state and recent messages, fed by the background SQS consumer.
+
+    Every queue keeps a bounded ring buffer of recent messages, and every robot a
+    snapshot (position, last action, recent hazards, last gesture). All methods are thread-safe.
+    """
+
+    def __init__(self, history_size: int = 50, hazard_history_size: int = 20):
+        self._condition = threading.Condition()
+        self._seq = 0
+        self.history_size = history_size
+        self._history = {queue_name: deque(maxlen=history_size) for queue_name in STATE_QUEUES}
+        self._robots: Dict[str, Dict[str, Any]] = {}
+        self.hazard_history_size = hazard_history_size
+        self._listeners: List[Callable[[str, Any], None]] = []
+
+    def add_listener(self, listener: Callable[[str, Any], None]) -> None:
+        """Call listener(queue_name, message) for every recorded message (on the consumer thread)."""
+        self._listeners.append(listener)
+
+    def _robot(self, robot_id: str) -> Dict[str, Any]:
+        if robot_id not in self._robots:
+            self._robots[robot_id] = {
+                "robot_id": robot_id,
+                "position": None,
+                "last_action": None,
+                "status": None,
+                "battery": None,
+                "last_feedback": None,
+                "last_detection": None,
+                "recent_hazards": deque(maxlen=self.hazard_history_size),
+                "last_gesture": None,
+                "updated_at": {},
+            }
+        return self._robots[robot_id]
+
+    def update(self, queue_name: str, message: Any) -> int:
+        """Record a message from a queue and return its sequence number."""
+        received_at = time.time()
+        with self._condition:
+            self._seq += 1
+            seq = self._seq
+            self._history.setdefault(queue_name, deque(maxlen=self.history_size)).append((seq, received_at, message))
+
+            if isinstance(message, dict):
+                robot = self._robot(message.get("robot_id") or DEFAULT_ROBOT_ID)
+                robot["updated_at"][queue_name] = received_at
+
+                if queue_name == "robo_feedback":
+                    robot["last_feedback"] = message
+                    for field in POSITION_FIELDS:
+                        if message.get(field) is not None:
+                            robot["position"] = message[field]
+                            break
+                    for field in ACTION_FIELDS:
+                        if message.get(field) is not None:
+                            robot["last_action"] = message[field]
+                            break
+                    for field in ("status", "battery"):
+                        if message.get(field) is not None:
+                            robot[field] = message[field]
+
+                elif queue_name == "robo_detection":
+                    robot["last_detection"] = message
+                    for result in message.get("results") or []:
+                        if isinstance(result, dict) and is_hazard(result):
+                            robot["recent_hazards"].append({
+                                "class": result.get("class"),
+                                "confidence": result.get("confidence"),
+                                "risk_level": result.get("risk_level"),
+                                "filename": message.get("filename"),
+                                "timestamp": message.get("timestamp"),
+                                "received_at": received_at,
+                            })
+
+                elif queue_name == "robo_gesture":
+                    robot["last_gesture"] = message
+
+            self._condition.notify_all()
+
+        # Outside the lock so a slow listener never blocks readers
+        for listener in self._listeners:
+            try:
+                listener(queue_name, message)
+            except Exception as e:
+                logger.warning(f"State listener failed for {queue_name}: {e}")
+        return seq
+
+    def latest_seq(self) -> int:
+        with self._condition:
+            return self._seq
+
+    def snapshot(self, robot_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Copies of the robot snapshots (one robot when robot_id is given) with data ages in seconds."""
+        now = time.time()
+        with self._condition:
+            robots = [self._robots[robot_id]] if robot_id in self._robots else (
+                [] if robot_id else list(self._robots.values()))
+            snapshots = []
+            for robot in robots:
+                snapshot = copy.deepcopy({key: value for key, value in robot.items() if key != "recent_hazards"})
+                snapshot["recent_hazards"] = copy.deepcopy(list(robot["recent_hazards"]))
+                snapshot["age_seconds"] = {
+                    queue_name: round(now - updated_at, 2)
+                    for queue_name, updated_at in robot["updated_at"].items()
+                }
+                snapshot["updated_at"] = {
+                    queue_name: datetime.fromtimestamp(updated_at).isoformat()
+                    for queue_name, updated_at in robot["updated_at"].items()
+                }
+                snapshots.append(snapshot)
+            return snapshots
+
+    def _messages_after(self, queue_name: str, after_seq: int, predicate: Callable[[Any], bool]) -> list:
+        return [
+            message for seq, _, message in self._history.get(queue_name, ())
+            if seq > after_seq and predicate(message)
+        ]
+
+    def wait_for_messages(self, queue_name: str, after_seq: int, timeout: float,
+                          predicate: Optional[Callable[[Any], bool]] = None, limit: int = 3) -> list:
+        """Wait up to timeout seconds for messages newer than after_seq that match predicate."""
+        predicate = predicate or (lambda message: True)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                messages = self._messages_after(queue_name, after_seq, predicate)
+                remaining = deadline - time.monotonic()
+                if messages or remaining <= 0:
+                    return copy.deepcopy(messages[:limit])
+                self._condition.wait(remaining)
+
+
+def receive_queue_messages(sqs_client, queue_url: str, wait_seconds: int = 0) -> List[Any]:
+    """Receive up to 10 messages in queue order, decode them and delete them from the queue."""
+    response = sqs_client.receive_message(
+        QueueUrl=queue_url,
+        MaxNumberOfMessages=10,
+        WaitTimeSeconds=wait_seconds,
+        MessageAttributeNames=['All']
+    )
+    messages = response.get('Messages', [])
+    message_bodies = []
+    for message in messages:
+        try:
+            message_body = decode_message_body(message)
+        except json.JSONDecodeError:
+            message_body = {"raw_body": message['Body']}
+        if isinstance(message_body, dict):
+            message_body["message_id"] = message['MessageId']
+        message_bodies.append(message_body)
+
+    if messages:
+        try:
+            sqs_client.delete_message_batch(
+                QueueUrl=queue_url,
+                Entries=[
+                    {"Id": str(index), "ReceiptHandle": message['ReceiptHandle']}
+                    for index, message in enumerate(messages)
+                ]
+            )
+        except Exception as e:
+            logger.warning(f"Could not delete messages from {queue_url}: {e}")
+    return message_bodies
+
+
+def drain_queue(sqs_client, queue_url: str, queue_name: str, store: RobotStateStore, wait_seconds: int = 0) -> int:
+    """Receive up to 10 messages and record them in the store in queue order.
+
+    Every message is consumed, including other robots' and other commands' messages, so none
+    is left at the head of its FIFO group; readers look for theirs in the store.
+    Returns the number of messages received.
+    """
+    message_bodies = receive_queue_messages(sqs_client, queue_url, wait_seconds)
+    for message_body in message_bodies:
+        store.update(queue_name, message_body)
+    return len(message_bodies)
+
+
+class RobotStateConsumer:
+    """Background threads that read the robot queues from a RobotBackend and feed a RobotStateStore.
+
+    The backend is the one configured by config.json "robot_backend" (SQS long polling,
+    simulator or replay). While it runs, the consumer is the only reader of its queues;
+    the robot tools read from the store instead so the two never compete for messages.
+    """
+
+    def __init__(self, store: RobotStateStore, backend: RobotBackend, queue_names=STATE_QUEUES):
+        self.store = store
+        self.backend = backend
+        self.queue_names = tuple(queue_names)
+        self._stop = threading.Event()
+        self._threads: Dict[str, threading.Thread] = {}
+
+    def start(self) -> None:
+        for queue_name in self.queue_names:
+            thread = threading.Thread(target=self._run, args=(queue_name,),
+                                      name=f"state-consumer-{queue_name}", daemon=True)
+            thread.start()
+            self._threads[queue_name] = thread
+        logger.info(f"Robot state consumer ({self.backend.name}) started for {', '.join(self.queue_names)}")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def is_consuming(self, queue_name: str) -> bool:
+        thread = self._threads.get(queue_name)
+        return thread is not None and thread.is_alive() and not self._stop.is_set()
+
+    def _run(self, queue_name: str) -> None:
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                # SQS long polling returns as soon as a message arrives
+                messages = self.backend.receive(queue_name, timeout=20)
+                backoff = 1
+            except Exception as e:
+                logger.warning(f"State consumer could not receive from {queue_name}: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60)
+                continue
+
+            for message in messages:
+                self.store.update(queue_name, message)
+
+
+state_store = RobotStateStore()
+_consumer: Optional[RobotStateConsumer] = None
+_consumer_lock = threading.Lock()
+
+
+def start_state_consumer(backend_factory: Callable[[], RobotBackend]) -> Optional[RobotStateConsumer]:
+    """Start the background consumer once per process on the backend from backend_factory
+    (the robot tools' backend, see robot_tools.get_robot_backend)."""
+    global _consumer
+    with _consumer_lock:
+        if _consumer is not None:
+            return _consumer
+        try:
+            _consumer = RobotStateConsumer(state_store, backend_factory())
+            _consumer.start()
+        except Exception as e:
+            logger.error(f"Could not start robot state consumer: {e}")
+            _consumer = None
+        return _consumer
+
+
+def get_state_consumer(queue_name: Optional[str] = None) -> Optional[RobotStateConsumer]:
+    """The running consumer (that is consuming queue_name, when given), or None."""
+    consumer = _consumer
+    if consumer is None:
+        return None
+    if queue_name is not None and not consumer.is_consuming(queue_name):
+        return None
+    return consumer
+
+
+@tool
+def get_robot_state(robot_id: Optional[str] = None):
+    """Get the current robot state instantly from the in-memory state cache.
+    Use this first for "what is the robot doing / where is it / any hazards?" questions;
+    it answers without waiting on the queues. Use get_robot_feedback only when you need
+    a new message that arrives after this call.
+
+    Args:
+        robot_id: Optional robot/thing name; omit to get every known robot
+
+    Returns:
+        Per-robot snapshots: position, last_action, status, battery, last feedback/detection/gesture,
+        recent_hazards (newest last) and age_seconds of each data source.
+    """
+    if get_state_consumer() is None:
+        return {
+            "status": "unavailable",
+            "message": "Robot state cache is not running. Use get_robot_feedback instead.",
+            "timestamp": datetime.now().isoformat()
+        }
+
+    robots = state_store.snapshot(robot_id)
+    if not robots:
+        return {
+            "status": "no_state",
+            "message": f"No messages received yet{f' for robot {robot_id}' if robot_id else ''}",
+            "timestamp": datetime.now().isoformat()
+        }
+    return {
+        "status": "success",
+        "robot_count": len(robots),
+        "timestamp": datetime.now().isoformat(),
+        "robots": robots
+    }
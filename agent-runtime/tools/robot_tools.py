@@ -3,10 +3,17 @@ from datetime import datetime
 import json
 import boto3
 import os
+import re
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from typing import Optional, List, Dict, Any
-from utils.s3_util import download_image_from_s3
+from typing import Optional, List, Dict, Any, Callable
+from utils.s3_util import S3Image, fetch_image_from_s3, get_s3_etag
+from utils.image_cache import ImageAnalysisCache, analysis_cache_key, content_hash
+from utils.sqs_util import get_sqs_client
+from tools.robot_state import drain_queue, get_state_consumer, receive_queue_messages, state_store
+from tools.robot_backend import RobotBackend, create_backend, no_messages_result, robot_filter, success_result
 
 logger = logging.getLogger(__name__)
 
@@ -17,52 +24,63 @@ logger = logging.getLogger(__name__)
 
 def _clear_queue(queue_name: str, config: dict, sqs_client=None) -> None:
     """Helper function to clear all messages from SQS FIFO queue.
-    
+
+    Old messages are moved into the in-memory state store (in queue order) instead of
+    being released back to the queue, where they would stay at the head of their robot's
+    FIFO group and hide newer messages from receive_message.
+
     Args:
         queue_name: Name of the FIFO queue (without .fifo suffix)
         config: Configuration dictionary containing accountId
-        sqs_client: Optional SQS client (creates new one if not provided)
+        sqs_client: Optional SQS client (the shared client when not provided)
     """
     try:
         region = "ap-northeast-2"
         account_id = config['accountId']
         
         if sqs_client is None:
-            sqs_client = boto3.client('sqs', region_name=region)
+            sqs_client = get_sqs_client()
         
         queue_url = f"https://sqs.{region}.amazonaws.com/{account_id}/{queue_name}.fifo"
         
         # Clear all messages in the queue
-        while True:
-            response = sqs_client.receive_message(
-                QueueUrl=queue_url,
-                MaxNumberOfMessages=10,
-                WaitTimeSeconds=0
-            )
-            messages = response.get('Messages', [])
-            if not messages:
-                break
-            
-            # Delete all messages
-            for message in messages:
-                try:
-                    sqs_client.delete_message(
-                        QueueUrl=queue_url,
-                        ReceiptHandle=message['ReceiptHandle']
-                    )
-                except Exception as e:
-                    logger.warning(f"Could not delete message {message['MessageId']}: {e}")
+        while drain_queue(sqs_client, queue_url, queue_name, state_store):
+            pass
     except Exception as e:
         logger.warning(f"Error clearing queue: {e}")
 
 
-def _get_fifo_messages(queue_name: str, config: dict) -> Dict[str, Any]:
+def _matches_command(correlation_id: str) -> Callable[[Any], bool]:
+    """Predicate for the feedback message of a command"""
+    return lambda message_body: isinstance(message_body, dict) \
+        and message_body.get("correlation_id") == correlation_id
+
+
+def _get_cached_messages(queue_name: str, robot_id: Optional[str] = None, timeout: int = 5) -> Dict[str, Any]:
+    """_get_fifo_messages counterpart used while the state consumer owns the queue.
+    Waits on the in-memory buffer for messages that arrive after the call (max timeout seconds).
+    """
+    current_time = datetime.now()
+    messages = state_store.wait_for_messages(
+        queue_name, state_store.latest_seq(), timeout, predicate=robot_filter(robot_id))
+    if messages:
+        return success_result(messages, current_time)
+    logger.info(f"No new messages received from {queue_name} state cache after {timeout} seconds")
+    return no_messages_result(queue_name, current_time)
+
+
+def _get_fifo_messages(queue_name: str, config: dict, robot_id: Optional[str] = None) -> Dict[str, Any]:
     """Helper function to get NEW messages from SQS FIFO queue.
     Clears the queue first, then waits for new messages (max 5 seconds).
+
+    Every received message is recorded in the state store and deleted; the result holds
+    the messages recorded after the queue was cleared, so another robot's messages (or
+    ones drained by a concurrent call) are still found by their own readers.
     
     Args:
         queue_name: Name of the FIFO queue (without .fifo suffix)
         config: Configuration dictionary containing accountId
+        robot_id: Only return this robot's messages
         
     Returns:
         Dictionary containing status and messages
@@ -75,7 +93,7 @@ def _get_fifo_messages(queue_name: str, config: dict) -> Dict[str, Any]:
     
     # Create SQS client
     try:
-        sqs = boto3.client('sqs', region_name=region)
+        sqs = get_sqs_client()
     except Exception as e:
         return {"error": f"Failed to create SQS client: {e}"}
     
@@ -91,6 +109,7 @@ def _get_fifo_messages(queue_name: str, config: dict) -> Dict[str, Any]:
     # Step 1: Clear all old messages from the queue
     logger.info(f"Clearing old messages from {queue_name} queue...")
     _clear_queue(queue_name, config, sqs)
+    after_seq = state_store.latest_seq()
     
     # Step 2: Wait for new messages ({max_attempts} seconds, check every 1 second)
     logger.info(f"Waiting for new messages from {queue_name} queue...")
@@ -101,82 +120,109 @@ def _get_fifo_messages(queue_name: str, config: dict) -> Dict[str, Any]:
         # Wait 1 second before checking
         time.sleep(1)
         
-        # Try to receive new messages
+        # Receive new messages into the state store
         try:
-            response = sqs.receive_message(
-                QueueUrl=queue_url,
-                MaxNumberOfMessages=3,
-                WaitTimeSeconds=0,
-                MessageAttributeNames=['All']
-            )
+            drain_queue(sqs, queue_url, queue_name, state_store)
         except Exception as e:
             return {"error": f"Error receiving messages: {e}"}
         
-        messages = response.get('Messages', [])
-        
+        messages = state_store.wait_for_messages(queue_name, after_seq, 0, predicate=robot_filter(robot_id))
         if messages:
-            # Found new messages! Process them
             logger.info(f"Found {len(messages)} new message(s) on attempt {attempt + 1}")
-            processed_messages = []
-            
-            for message in messages:
-                try:
-                    # Parse message body
-                    message_body = json.loads(message['Body'])
-                    
-                    # Add message_id to the original message format
-                    message_body["message_id"] = message['MessageId']
-                    processed_messages.append(message_body)
-                    
-                    # Delete the message after processing
-                    try:
-                        sqs.delete_message(
-                            QueueUrl=queue_url,
-                            ReceiptHandle=message['ReceiptHandle']
-                        )
-                    except Exception as e:
-                        logger.warning(f"Could not delete message {message['MessageId']}: {e}")
-                        
-                except json.JSONDecodeError:
-                    # Handle non-JSON messages
-                    raw_message = {
-                        "message_id": message['MessageId'],
-                        "raw_body": message['Body']
-                    }
-                    processed_messages.append(raw_message)
-                    
-                    # Delete the message
-                    try:
-                        sqs.delete_message(
-                            QueueUrl=queue_url,
-                            ReceiptHandle=message['ReceiptHandle']
-                        )
-                    except Exception as e:
-                        logger.warning(f"Could not delete message {message['MessageId']}: {e}")
-            
-            return {
-                "status": "success",
-                "message_count": len(processed_messages),
-                "timestamp": current_time.isoformat(),
-                "messages": processed_messages
-            }
+            return success_result(messages, current_time)
     
     # No messages received within 5 seconds
     logger.info(f"No new messages received from {queue_name} queue after {max_attempts} seconds")
-    return {
-        "status": "no_messages",
-        "message": f"No messages available in the {queue_name} queue",
-        "timestamp": current_time.isoformat()
-    }
+    return no_messages_result(queue_name, current_time)
+
+
+class SQSBackend(RobotBackend):
+    """Real robot queues (the robot tools read the state cache instead while the background consumer runs)."""
+    name = "sqs"
+
+    def __init__(self, config: dict):
+        self.config = config
+
+    def _queue_url(self, queue_name: str) -> str:
+        return f"https://sqs.ap-northeast-2.amazonaws.com/{self.config['accountId']}/{queue_name}.fifo"
+
+    def get_messages(self, queue_name: str, robot_id: Optional[str] = None, timeout: float = 5) -> Dict[str, Any]:
+        return _get_fifo_messages(queue_name, self.config, robot_id)
+
+    def receive(self, queue_name: str, timeout: float = 20) -> List[dict]:
+        # Long polling returns as soon as a message arrives
+        return receive_queue_messages(get_sqs_client(), self._queue_url(queue_name), min(20, max(0, int(timeout))))
+
+    def await_feedback(self, correlation_id: str, timeout: float) -> Optional[dict]:
+        matches_command = _matches_command(correlation_id)
+
+        sqs = get_sqs_client()
+        queue_url = self._queue_url("robo_feedback")
+        deadline = time.monotonic() + timeout
+
+        # The robot's feedback group is drained in order into the state store, so feedback of
+        # other commands and robots never stays at the head of the group; it waits in the
+        # store for its own reader
+        while True:
+            matches = state_store.wait_for_messages("robo_feedback", 0, 0, predicate=matches_command, limit=1)
+            if matches:
+                return matches[0]
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            # Long polling returns as soon as a message arrives; kept short so feedback
+            # drained by a concurrent reader is noticed in the store
+            drain_queue(sqs, queue_url, "robo_feedback", state_store,
+                        wait_seconds=min(5, max(1, int(remaining))))
+
+
+_backend: Optional[RobotBackend] = None
+_backend_lock = threading.Lock()
+
+
+def _get_backend(config: dict) -> RobotBackend:
+    """Backend selected by config.json "robot_backend" (SQS by default), created once per process."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend(config.get("robot_backend"), lambda: SQSBackend(config))
+        return _backend
+
+
+def get_robot_backend() -> RobotBackend:
+    """The robot tools' backend built from config/config.json; the state consumer reads the same one."""
+    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.json')
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    return _get_backend(config)
+
+
+def _get_messages(config: dict, queue_name: str, robot_id: Optional[str] = None) -> Dict[str, Any]:
+    """New messages of a queue; read from the state cache while the background consumer owns the queue."""
+    if get_state_consumer(queue_name) is not None:
+        return _get_cached_messages(queue_name, robot_id)
+    return _get_backend(config).get_messages(queue_name, robot_id)
+
+
+def _await_feedback(config: dict, correlation_id: str, timeout: float) -> Optional[dict]:
+    """Feedback for a command; the state cache keeps recent feedback, so feedback that
+    arrived before this call is found as well while the consumer runs."""
+    if get_state_consumer("robo_feedback") is not None:
+        matches = state_store.wait_for_messages(
+            "robo_feedback", 0, timeout, predicate=_matches_command(correlation_id), limit=1)
+        return matches[0] if matches else None
+    return _get_backend(config).await_feedback(correlation_id, timeout)
 
 
 @tool
-def get_robot_feedback():
+def get_robot_feedback(robot_id: Optional[str] = None):
     """Get the latest robot feedback information.
     This tool retrieves feedback about robot actions and command execution results.
 
     Args:
-        None
+        robot_id: Optional robot/thing name (e.g. robo-dog-001) to only return that robot's messages
 
     Returns:
         A list of robot feedback messages with timestamps and execution details.
@@ -192,8 +238,8 @@ def get_robot_feedback():
         except json.JSONDecodeError as e:
             return {"error": f"Invalid JSON in config.json: {e}"}
         
-        # Use helper function to get messages
-        result = _get_fifo_messages("robo_feedback", config)
+        # Get messages from the configured backend (SQS, simulator or replay)
+        result = _get_messages(config, "robo_feedback", robot_id)
         
         if "error" in result:
             return result
@@ -208,17 +254,20 @@ def get_robot_feedback():
 
 
 @tool
-def get_robot_detection():
+def get_robot_detection(robot_id: Optional[str] = None):
     """Get the latest robot detection information.
     This tool retrieves emergency situation detection data including emergency_situation, explosion, fire, person_down 
     and the S3 path of the detected image file.
 
     Args:
-        None
+        robot_id: Optional robot/thing name (e.g. robo-dog-001) to only return that robot's messages
 
     Returns:
         A list of robot detection messages with timestamps, detection details, and S3 image paths.
         Detection types include: emergency_situation, explosion, fire, person_down
+        Besides the full frame (filename), messages may carry roi_filename (crop around the
+        hazard boxes) and thumbnail_filename (downscaled frame); prefer these for image analysis.
+        Each result carries a risk_level (LOW, MEDIUM, HIGH) computed on the robot; report it as-is.
     """
     try:
         # Load configuration
@@ -231,66 +280,12 @@ def get_robot_detection():
         except json.JSONDecodeError as e:
             return {"error": f"Invalid JSON in config.json: {e}"}
         
-        # Use helper function to get messages
-        result = _get_fifo_messages("robo_detection", config)
+        # Get messages from the configured backend (SQS, simulator or replay)
+        result = _get_messages(config, "robo_detection", robot_id)
         
         if "error" in result:
             return result
         
-        # If no messages received, return mock data for testing
-        if result.get("status") == "no_messages":
-            logger.info("No detection messages received - returning mock data for testing")
-            current_timestamp = int(time.time())
-            
-            mock_messages = [
-                {
-                    "filename": "s3://industry-robot-detected-images/detected/20251013_173444-frame_01005.jpg",
-                    "timestamp": current_timestamp,
-                    "results": [
-                        {
-                            "class": "fire",
-                            "confidence": 0.89,
-                            "position": [320, 150, 680, 420],
-                            "risk_level": "HIGH"
-                        }
-                    ],
-                    "message_id": "mock_detection_1"
-                },
-                {
-                    "filename": "s3://industry-robot-detected-images/detected/20251013_173508-frame_01028.jpg",
-                    "timestamp": current_timestamp + 1,
-                    "results": [
-                        {
-                            "class": "fire",
-                            "confidence": 0.92,
-                            "position": [280, 180, 720, 450],
-                            "risk_level": "HIGH"
-                        }
-                    ],
-                    "message_id": "mock_detection_2"
-                },
-                {
-                    "filename": "s3://industry-robot-detected-images/detected/20251013_173515-frame_01035.jpg",
-                    "timestamp": current_timestamp + 2,
-                    "results": [
-                        {
-                            "class": "fire",
-                            "confidence": 0.87,
-                            "position": [350, 200, 650, 480],
-                            "risk_level": "HIGH"
-                        }
-                    ],
-                    "message_id": "mock_detection_3"
-                }
-            ]
-            
-            return {
-                "status": "success",
-                "message_count": 3,
-                "timestamp": datetime.now().isoformat(),
-                "messages": mock_messages
-            }
-        
         # Return S3 URLs as-is - frontend will generate presigned URLs
         return result
         
@@ -302,13 +297,13 @@ def get_robot_detection():
 
 
 @tool
-def get_robot_gesture():
+def get_robot_gesture(robot_id: Optional[str] = None):
     """Get the latest robot gesture information.
     This tool retrieves human gesture recognition data including what gesture the detected person is making
     and the S3 path of the gesture image file.
 
     Args:
-        None
+        robot_id: Optional robot/thing name (e.g. robo-dog-001) to only return that robot's messages
 
     Returns:
         A list of robot gesture messages with timestamps, gesture details, and S3 image paths.
@@ -325,8 +320,8 @@ def get_robot_gesture():
         except json.JSONDecodeError as e:
             return {"error": f"Invalid JSON in config.json: {e}"}
         
-        # Use helper function to get messages
-        result = _get_fifo_messages("robo_gesture", config)
+        # Get messages from the configured backend (SQS, simulator or replay)
+        result = _get_messages(config, "robo_gesture", robot_id)
         
         if "error" in result:
             return result
@@ -370,9 +365,199 @@ def wait_for_seconds(seconds: int) -> str:
     return f"{seconds}초 대기 완료 (실제 경과 시간: {elapsed:.2f}초)"
 
 
+@tool
+def await_command_result(correlation_id: str, timeout: int = 15):
+    """Wait for the robot feedback that matches a command's correlation ID.
+    Call this right after command (use the correlation_id it returned) instead of
+    wait_for_seconds + get_robot_feedback. It returns as soon as the robot reports completion.
+
+    Args:
+        correlation_id: The correlation_id returned by the command tool
+        timeout: Maximum seconds to wait (1-120, default 15)
+
+    Returns:
+        The matching feedback message and the elapsed time, or a timeout status.
+    """
+    if not correlation_id:
+        return {"error": "correlation_id is required"}
+    timeout = max(1, min(int(timeout), 120))
+
+    try:
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.json')
+        try:
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            return {"error": f"config.json not found at {config_path}"}
+        except json.JSONDecodeError as e:
+            return {"error": f"Invalid JSON in config.json: {e}"}
+
+        start = time.monotonic()
+        message = _await_feedback(config, correlation_id, timeout)
+        elapsed = round(time.monotonic() - start, 2)
+
+        if message is not None:
+            return {
+                "status": "success",
+                "correlation_id": correlation_id,
+                "elapsed_seconds": elapsed,
+                "message": message
+            }
+
+        logger.info(f"No feedback for correlation_id {correlation_id} within {timeout} seconds")
+        return {
+            "status": "timeout",
+            "correlation_id": correlation_id,
+            "elapsed_seconds": elapsed,
+            "message": f"No feedback for command {correlation_id} within {timeout} seconds"
+        }
+
+    except Exception as e:
+        return {
+            "error": f"Unexpected error in await_command_result: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+IMAGE_ANALYSIS_MODEL_ID = "us.amazon.nova-lite-v1:0"
+IMAGE_ANALYSIS_PROMPT = "보이는 이미지에 대한 내용을 설명하세요. 감지된 객체, 환경의 물리적 상태, 시각적으로 확인되는 요소들을 객관적으로 분석해주세요."
+
+# Frames above the pixel budget are downscaled before they are sent (1280x720 by default)
+DEFAULT_IMAGE_MAX_PIXELS = 1280 * 720
+
+_image_cache: Optional[ImageAnalysisCache] = None
+_image_fetch_settings: Optional[dict] = None
+_image_settings_lock = threading.Lock()
+
+_bedrock_client = None
+_bedrock_client_lock = threading.Lock()
+
+
+def _get_bedrock_client():
+    """Bedrock Runtime client shared by the image analysis workers (the default pool of 10
+    connections covers IMAGE_ANALYSIS_MAX_WORKERS)."""
+    global _bedrock_client
+    with _bedrock_client_lock:
+        if _bedrock_client is None:
+            _bedrock_client = boto3.client('bedrock-runtime', region_name='us-west-2')
+        return _bedrock_client
+
+
+def _load_image_settings() -> None:
+    """Read config.json "image_cache" and "image_fetch" once per process."""
+    global _image_cache, _image_fetch_settings
+    with _image_settings_lock:
+        if _image_fetch_settings is not None:
+            return
+        config = {}
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.json')
+        try:
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Using default image settings: {e}")
+
+        cache_settings = dict(config.get("image_cache") or {})
+        if cache_settings.pop("enabled", True):
+            _image_cache = ImageAnalysisCache(**cache_settings)
+        _image_fetch_settings = {"max_pixels": DEFAULT_IMAGE_MAX_PIXELS, **(config.get("image_fetch") or {})}
+
+
+def _get_image_cache() -> Optional[ImageAnalysisCache]:
+    """Analysis cache configured by config.json "image_cache" (None when disabled)."""
+    _load_image_settings()
+    return _image_cache
+
+
+def _fetch_image(image_path: str) -> S3Image:
+    """Stream an image from S3, downscaled to the config.json "image_fetch" pixel budget."""
+    _load_image_settings()
+    image = fetch_image_from_s3(image_path, **_image_fetch_settings)
+    if image.downscaled:
+        logger.info(f"Downscaled {image_path} to {image.width}x{image.height} "
+                    f"({image.original_bytes} -> {len(image.data)} bytes)")
+    return image
+
+
+def _content_key(content_id: str) -> str:
+    """The pixel budget changes what the model sees, so it is part of the cache key."""
+    _load_image_settings()
+    return f"{content_id}@{_image_fetch_settings.get('max_pixels')}"
+
+
+def _image_content_id(image_path: str) -> tuple:
+    """(content_id, image) of an S3 image; the ETag identifies the content without
+    downloading it, so image is only set when the HEAD request failed."""
+    try:
+        return _content_key(get_s3_etag(image_path)), None
+    except Exception as e:
+        logger.warning(f"Falling back to content hash for {image_path}: {e}")
+        image = _fetch_image(image_path)
+        return _content_key(content_hash(image.data)), image
+
+
+def _converse_images(prompt: str, images: List[tuple]) -> Optional[str]:
+    """One Converse request with the prompt followed by (label, S3Image) pairs."""
+    content = [{"text": prompt}]
+    for label, image in images:
+        if label:
+            content.append({"text": label})
+        content.append({
+            "image": {
+                "format": image.format,
+                "source": {
+                    "bytes": image.data
+                }
+            }
+        })
+
+    # Call Bedrock Converse API
+    response = _get_bedrock_client().converse(
+        modelId=IMAGE_ANALYSIS_MODEL_ID,
+        messages=[{"role": "user", "content": content}],
+    )
+
+    # Extract the response text
+    if 'output' in response and 'message' in response['output']:
+        content = response['output']['message']['content']
+        if isinstance(content, list) and len(content) > 0:
+            return content[0]['text']
+        elif isinstance(content, str):
+            return content
+    return None
+
+
+def _analyze_image(image_path: str) -> str:
+    """Analysis of one image, answered from the cache when the same content was analyzed before."""
+    cache = _get_image_cache()
+    cache_key = None
+    image = None
+
+    if cache is not None:
+        content_id, image = _image_content_id(image_path)
+        cache_key = analysis_cache_key(content_id, IMAGE_ANALYSIS_MODEL_ID, IMAGE_ANALYSIS_PROMPT)
+        cached = cache.get(cache_key)
+        logger.info(f"Image analysis cache {'hit' if cached is not None else 'miss'} for {image_path}: {cache.stats()}")
+        if cached is not None:
+            return cached
+
+    # Download image from S3
+    if image is None:
+        image = _fetch_image(image_path)
+
+    analysis = _converse_images(IMAGE_ANALYSIS_PROMPT, [(None, image)])
+    if analysis is None:
+        return "이미지 분석 결과를 가져올 수 없습니다."
+
+    if cache is not None:
+        cache.put(cache_key, analysis)
+    return analysis
+
+
 @tool
 def analyze_robot_image(image_path: str) -> str:
     """Analyze a specific robot image from S3 using Bedrock Converse API.
+    Repeated analyses of the same image are answered from a cache.
     
     Args:
         image_path: S3 path to the image to analyze
@@ -380,53 +565,139 @@ def analyze_robot_image(image_path: str) -> str:
     Returns:
         Analysis result of the image
     """
-    try:        
-        # Download image from S3
-        image_bytes = download_image_from_s3(image_path)
-                
-        # Initialize Bedrock client
-        bedrock = boto3.client('bedrock-runtime', region_name='us-west-2')
-        
-        # Prepare the message for Bedrock Converse API
-        messages = [
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "text": "보이는 이미지에 대한 내용을 설명하세요. 감지된 객체, 환경의 물리적 상태, 시각적으로 확인되는 요소들을 객관적으로 분석해주세요."
-                    },
-                    {
-                        "image": {
-                            "format": "png",
-                            "source": {
-                                "bytes": image_bytes
-                            }
-                        }
-                    }
-                ]
-            }
-        ]
-        
-        # Call Bedrock Converse API
-        response = bedrock.converse(
-            modelId="us.amazon.nova-lite-v1:0",
-            messages=messages,
-        )
-        
-        # Extract the response text
-        if 'output' in response and 'message' in response['output']:
-            content = response['output']['message']['content']
-            if isinstance(content, list) and len(content) > 0:
-                return content[0]['text']
-            elif isinstance(content, str):
-                return content
-        
-        return "이미지 분석 결과를 가져올 수 없습니다."
-        
+    try:
+        return _analyze_image(image_path)
     except Exception as e:
         return f"Error analyzing image {image_path}: {str(e)}"
 
 
+# Shared by all analyze_robot_images calls so concurrent requests stay within the bound
+IMAGE_ANALYSIS_MAX_WORKERS = 4
+MAX_IMAGES_PER_REQUEST = 10
+COMBINED_IMAGE_ANALYSIS_PROMPT = (
+    "다음 {count}장의 로봇 이미지를 분석하세요. 각 이미지마다 '[이미지 N]'으로 시작하는 단락에 "
+    "감지된 객체, 환경의 물리적 상태, 시각적으로 확인되는 요소들을 객관적으로 설명하고, "
+    "마지막에 '[종합]'으로 시작하는 단락에 이미지 전체를 종합한 요약을 작성하세요."
+)
+_image_executor = ThreadPoolExecutor(max_workers=IMAGE_ANALYSIS_MAX_WORKERS, thread_name_prefix="image-analysis")
+
+
+def _split_combined_analysis(text: str, count: int) -> tuple:
+    """Split a combined answer into per-image analyses and the summary ([이미지 N] / [종합] sections)."""
+    sections = {}
+    parts = re.split(r'\[(이미지\s*\d+|종합)\]', text)
+    for label, body in zip(parts[1::2], parts[2::2]):
+        sections[re.sub(r'\s+', ' ', label)] = body.strip()
+    analyses = [sections.get(f"이미지 {index + 1}") for index in range(count)]
+    # Without the expected sections the whole answer is the summary
+    summary = sections.get("종합") or (text.strip() if not any(analyses) else None)
+    return analyses, summary
+
+
+def _analyze_images_combined(image_paths: List[str], errors: List[dict]) -> tuple:
+    """All frames in one Converse request; returns (results, summary)."""
+    cache = _get_image_cache()
+    prompt = COMBINED_IMAGE_ANALYSIS_PROMPT.format(count=len(image_paths))
+
+    # Content IDs (and downloads, when the HEAD request fails) run on the pool
+    fetched = {}
+    futures = {path: _image_executor.submit(_image_content_id, path) for path in image_paths}
+    for path, future in futures.items():
+        try:
+            fetched[path] = future.result()
+        except Exception as e:
+            errors.append({"image_path": path, "error": str(e)})
+    paths = [path for path in image_paths if path in fetched]
+    if not paths:
+        return [], None
+
+    cache_key = analysis_cache_key(
+        "|".join(fetched[path][0] for path in paths), IMAGE_ANALYSIS_MODEL_ID, prompt)
+    text = cache.get(cache_key) if cache is not None else None
+
+    if text is None:
+        downloads = {
+            path: _image_executor.submit(_fetch_image, path)
+            for path in paths if fetched[path][1] is None
+        }
+        images = []
+        for path in list(paths):
+            try:
+                image = fetched[path][1] if path not in downloads else downloads[path].result()
+                images.append((path, image))
+            except Exception as e:
+                errors.append({"image_path": path, "error": str(e)})
+        if not images:
+            return [], None
+        if len(images) != len(paths):
+            # The prompt and the cache key must match the frames actually sent
+            paths = [path for path, _ in images]
+            prompt = COMBINED_IMAGE_ANALYSIS_PROMPT.format(count=len(paths))
+            cache_key = None
+
+        text = _converse_images(prompt, [
+            (f"[이미지 {index + 1}] {path}", image) for index, (path, image) in enumerate(images)
+        ])
+        if text is None:
+            return [], "이미지 분석 결과를 가져올 수 없습니다."
+        if cache is not None and cache_key is not None:
+            cache.put(cache_key, text)
+
+    analyses, summary = _split_combined_analysis(text, len(paths))
+    results = [{"image_path": path, "analysis": analysis} for path, analysis in zip(paths, analyses)]
+    return results, summary
+
+
+@tool
+def analyze_robot_images(image_paths: List[str], combined: bool = True) -> dict:
+    """Analyze several robot images from S3 at once (e.g. every frame of a detection result).
+    Use this instead of calling analyze_robot_image once per image.
+
+    Args:
+        image_paths: S3 paths of the images to analyze (up to 10)
+        combined: True (default) sends all frames in one model request and returns a merged summary;
+            False analyzes each frame separately in parallel (each result is cached per image)
+
+    Returns:
+        Per-image analyses, a merged summary, failed images and the elapsed time.
+    """
+    start = time.monotonic()
+    # Duplicates are analyzed once, in the order given
+    image_paths = list(dict.fromkeys(path for path in image_paths or [] if path))
+    if not image_paths:
+        return {"error": "image_paths is required"}
+    if len(image_paths) > MAX_IMAGES_PER_REQUEST:
+        return {"error": f"At most {MAX_IMAGES_PER_REQUEST} images can be analyzed at once (got {len(image_paths)})"}
+
+    errors: List[dict] = []
+    try:
+        if combined:
+            results, summary = _analyze_images_combined(image_paths, errors)
+        else:
+            futures = {path: _image_executor.submit(_analyze_image, path) for path in image_paths}
+            results = []
+            for path, future in futures.items():
+                try:
+                    results.append({"image_path": path, "analysis": future.result()})
+                except Exception as e:
+                    errors.append({"image_path": path, "error": str(e)})
+            summary = "\n\n".join(f"[{result['image_path']}]\n{result['analysis']}" for result in results) or None
+    except Exception as e:
+        return {
+            "error": f"Unexpected error in analyze_robot_images: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }
+
+    return {
+        "status": "success" if results and not errors else ("partial" if results else "failed"),
+        "image_count": len(results),
+        "elapsed_seconds": round(time.monotonic() - start, 2),
+        "results": results,
+        "summary": summary,
+        "errors": errors
+    }
+
+
 
 def extract_image_path_from_data(data_json: str, data_type: str = "detection") -> str:
     """Extract S3 image path from detection or gesture data JSON string.
@@ -1,3 +1,5 @@
-from utils.s3_util import download_image_from_s3
+from utils.s3_util import S3Image, download_image_from_s3, fetch_image_from_s3, get_s3_etag
+from utils.sqs_util import decode_message_body
+from utils.image_cache import ImageAnalysisCache
 
-__all__ = ['download_image_from_s3']
+__all__ = ['S3Image', 'download_image_from_s3', 'fetch_image_from_s3', 'get_s3_etag', 'decode_message_body', 'ImageAnalysisCache']
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+def analysis_cache_key(content_id: str, model_id: str, prompt: str) -> str:
+    """이미지 식별자(S3 ETag 또는 내용 해시), 모델, 프롬프트로 캐시 키를 만듭니다."""
+    return hashlib.sha256(f"{content_id}\n{model_id}\n{prompt}".encode('utf-8')).hexdigest()
+
+
+def content_hash(data: bytes) -> str:
+    """ETag를 얻지 못했을 때 사용하는 이미지 내용 해시입니다."""
+    return "sha256:" + hashlib.sha256(data).hexdigest()
+
+
+class ImageAnalysisCache:
+    """이미지 분석 결과를 위한 2단계 캐시 (프로세스 내 LRU + 선택적 디스크 저장소).
+
+    - 메모리: 최대 max_entries개, LRU 순서로 제거
+    - 디스크: disk_dir이 설정된 경우 키별 JSON 파일, 최대 max_disk_entries개 (오래된 파일부터 제거)
+    - 두 단계 모두 ttl_seconds가 지난 항목은 만료 처리
+    모든 메서드는 스레드 안전합니다.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 86400,
+                 disk_dir: Optional[str] = None, max_disk_entries: int = 2000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[tuple]:
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry["created_at"], entry["value"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable image cache file {path}: {e}")
+            return None
+
+    def _write_disk(self, key: str, created_at: float, value: str) -> None:
+        path = self._disk_path(key)
+        try:
+            # 임시 파일에 쓴 뒤 교체하여 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 함
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"created_at": created_at, "value": value}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError as e:
+            logger.warning(f"Could not write image cache file {path}: {e}")
+
+    def _prune_disk(self) -> None:
+        files = [
+            os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir)
+            if name.endswith('.json')
+        ]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+                self._stats["evictions"] += 1
+            except OSError:
+                pass
+
+    def _remember(self, key: str, created_at: float, value: str) -> None:
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 분석 결과를 반환합니다 (없거나 만료되면 None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._entries.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return entry[1]
+                del self._entries[key]
+                self._stats["expired"] += 1
+
+            if self.disk_dir:
+                entry = self._read_disk(key)
+                if entry is not None:
+                    if not self._expired(entry[0]):
+                        self._remember(key, *entry)
+                        self._stats["disk_hits"] += 1
+                        return entry[1]
+                    self._stats["expired"] += 1
+                    try:
+                        os.remove(self._disk_path(key))
+                    except OSError:
+                        pass
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        """분석 결과를 메모리와 (설정된 경우) 디스크에 저장합니다."""
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, value)
+            if self.disk_dir:
+                self._write_disk(key, created_at, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률 등 캐시 지표를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        return stats
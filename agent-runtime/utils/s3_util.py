@@ -1,36 +1,175 @@
+import io
+import threading
 import boto3
+from botocore.config import Config as BotoConfig
+from dataclasses import dataclass
+from typing import Optional
 from urllib.parse import urlparse
+from PIL import Image
+
+
+# Bedrock Converse가 지원하는 이미지 형식의 매직 바이트
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+STREAM_CHUNK_BYTES = 64 * 1024
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+@dataclass
+class S3Image:
+    """S3에서 가져온 이미지 (축소된 경우 data는 다시 인코딩된 바이트)"""
+    data: bytes
+    format: str
+    width: int
+    height: int
+    original_bytes: int
+    downscaled: bool = False
+
+
+def get_s3_client():
+    """프로세스 전체에서 공유하는 S3 클라이언트를 반환합니다 (연결 풀 재사용)."""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is None:
+            _s3_client = boto3.client('s3', config=BotoConfig(max_pool_connections=16))
+        return _s3_client
+
+
+def _parse_s3_url(s3_url: str) -> tuple:
+    parsed_url = urlparse(s3_url)
+    if parsed_url.scheme != 's3':
+        raise ValueError(f"Invalid S3 URL: {s3_url}")
+    return parsed_url.netloc, parsed_url.path.lstrip('/')
+
+
+def detect_image_format(data: bytes) -> Optional[str]:
+    """매직 바이트로 이미지 형식(png, jpeg, gif, webp)을 판별합니다. 알 수 없으면 None."""
+    for signature, image_format in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return image_format
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    return None
 
 
 def download_image_from_s3(s3_url: str) -> bytes:
     """S3 URL에서 이미지를 다운로드하여 bytes로 반환합니다.
-    
+
     Args:
         s3_url: S3 이미지 URL (예: s3://bucket-name/path/to/image.jpg)
-        
+
     Returns:
         이미지 데이터의 bytes
-        
+
     Raises:
         Exception: S3 다운로드 실패 시
     """
+    return fetch_image_from_s3(s3_url).data
+
+
+def fetch_image_from_s3(s3_url: str, max_pixels: Optional[int] = None, jpeg_quality: int = 85,
+                        max_bytes: int = MAX_IMAGE_BYTES) -> S3Image:
+    """S3 이미지를 청크 단위로 스트리밍하여 가져오고, 필요하면 픽셀 예산에 맞게 축소합니다.
+
+    첫 청크의 매직 바이트로 형식을 판별하므로 이미지가 아닌 객체는 전체를 받기 전에 중단합니다.
+
+    Args:
+        s3_url: S3 이미지 URL (예: s3://bucket-name/path/to/image.jpg)
+        max_pixels: 최대 픽셀 수 (가로 x 세로). 초과하면 비율을 유지하며 축소, None이면 축소하지 않음
+        jpeg_quality: 축소 후 JPEG로 다시 인코딩할 때의 품질
+        max_bytes: 허용하는 최대 객체 크기
+
+    Returns:
+        S3Image (데이터, 형식, 크기)
+
+    Raises:
+        Exception: 다운로드 실패, 지원하지 않는 형식, 크기 초과 시
+    """
     try:
-        # S3 URL 파싱
-        parsed_url = urlparse(s3_url)
-        if parsed_url.scheme != 's3':
-            raise ValueError(f"Invalid S3 URL: {s3_url}")
-        
-        bucket_name = parsed_url.netloc
-        object_key = parsed_url.path.lstrip('/')
-        
-        # S3 클라이언트 생성
-        s3_client = boto3.client('s3')
-        
-        # S3에서 객체 다운로드
-        response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
-        image_bytes = response['Body'].read()
-        
-        return image_bytes
-        
+        bucket_name, object_key = _parse_s3_url(s3_url)
+        response = get_s3_client().get_object(Bucket=bucket_name, Key=object_key)
+        content_length = response.get('ContentLength') or 0
+        if content_length > max_bytes:
+            response['Body'].close()
+            raise ValueError(f"Image is too large: {content_length} bytes (max {max_bytes})")
+
+        buffer = bytearray()
+        image_format = None
+        body = response['Body']
+        try:
+            for chunk in body.iter_chunks(chunk_size=STREAM_CHUNK_BYTES):
+                buffer += chunk
+                if image_format is None and len(buffer) >= 12:
+                    image_format = detect_image_format(bytes(buffer[:12]))
+                    if image_format is None:
+                        raise ValueError(f"Unsupported image format (magic bytes {bytes(buffer[:8]).hex()})")
+                if len(buffer) > max_bytes:
+                    raise ValueError(f"Image is larger than {max_bytes} bytes")
+        finally:
+            body.close()
+
+        data = bytes(buffer)
+        image_format = image_format or detect_image_format(data)
+        if image_format is None:
+            raise ValueError("Unsupported image format")
+        return downscale_image(data, image_format, max_pixels, jpeg_quality)
+
     except Exception as e:
         raise Exception(f"Failed to download image from S3: {str(e)}")
+
+
+def downscale_image(data: bytes, image_format: str, max_pixels: Optional[int] = None,
+                    jpeg_quality: int = 85) -> S3Image:
+    """이미지가 max_pixels를 초과하면 비율을 유지하며 축소합니다.
+
+    헤더만 읽어 크기를 확인하므로 예산 이내의 이미지는 디코딩하지 않고 원본 그대로 반환합니다.
+    JPEG는 draft 모드로 DCT 단계에서 먼저 줄여 디코딩 비용을 낮춥니다.
+    """
+    image = Image.open(io.BytesIO(data))
+    width, height = image.size
+    if not max_pixels or width * height <= max_pixels or image_format == 'gif':
+        return S3Image(data, image_format, width, height, len(data))
+
+    scale = (max_pixels / (width * height)) ** 0.5
+    target = (max(1, int(width * scale)), max(1, int(height * scale)))
+    if image_format == 'jpeg':
+        image.draft('RGB', target)
+    image.thumbnail(target, Image.Resampling.LANCZOS)
+
+    output = io.BytesIO()
+    if image.mode in ('RGBA', 'LA', 'P'):
+        # 투명도가 있는 이미지는 PNG로 유지
+        image.save(output, format='PNG', optimize=True)
+        output_format = 'png'
+    else:
+        image.convert('RGB').save(output, format='JPEG', quality=jpeg_quality, optimize=True)
+        output_format = 'jpeg'
+    return S3Image(output.getvalue(), output_format, image.width, image.height, len(data), downscaled=True)
+
+
+def get_s3_etag(s3_url: str) -> str:
+    """S3 객체를 다운로드하지 않고 ETag를 조회합니다 (HEAD 요청).
+
+    Args:
+        s3_url: S3 객체 URL (예: s3://bucket-name/path/to/image.jpg)
+
+    Returns:
+        "etag:" 접두사가 붙은 ETag (같은 내용으로 업로드된 객체는 같은 ETag)
+
+    Raises:
+        Exception: 조회 실패 시
+    """
+    try:
+        bucket_name, object_key = _parse_s3_url(s3_url)
+        response = get_s3_client().head_object(Bucket=bucket_name, Key=object_key)
+        return "etag:" + response['ETag'].strip('"')
+
+    except Exception as e:
+        raise Exception(f"Failed to get ETag from S3: {str(e)}")
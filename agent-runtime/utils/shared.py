@@ -0,0 +1,26 @@
+"""lambda-common 공용 모듈 (robot_actions, sqs_forwarder)을 불러옵니다.
+
+로컬 실행에서는 저장소의 lambda-common을 그대로 사용하고, 컨테이너에서는
+배포 스크립트(scripts/deploy.sh, scripts/deploy.py)가 복사해 둔 lambda_common/을 사용합니다.
+"""
+import sys
+from pathlib import Path
+
+_RUNTIME_DIR = Path(__file__).resolve().parent.parent
+SHARED_DIRS = (_RUNTIME_DIR.parent / "lambda-common", _RUNTIME_DIR / "lambda_common")
+
+for _shared_dir in SHARED_DIRS:
+    if (_shared_dir / "sqs_forwarder.py").is_file():
+        if str(_shared_dir) not in sys.path:
+            sys.path.append(str(_shared_dir))
+        break
+else:
+    raise ImportError(
+        f"lambda-common modules not found in {' or '.join(map(str, SHARED_DIRS))}; "
+        "deploy with scripts/deploy.sh or scripts/deploy.py to bundle them"
+    )
+
+import robot_actions  # noqa: E402
+import sqs_forwarder  # noqa: E402
+
+__all__ = ["robot_actions", "sqs_forwarder"]
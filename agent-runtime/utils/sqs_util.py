@@ -0,0 +1,50 @@
+import binascii
+import json
+import threading
+import boto3
+from botocore.config import Config as BotoConfig
+from utils.shared import sqs_forwarder
+
+# 로봇 큐가 있는 리전
+SQS_REGION = "ap-northeast-2"
+
+_sqs_client = None
+_sqs_client_lock = threading.Lock()
+
+
+def get_sqs_client():
+    """프로세스 전체에서 공유하는 SQS 클라이언트를 반환합니다.
+
+    기본 세션의 boto3.client()는 스레드에서 동시에 호출하면 안전하지 않으므로, 전용 세션에서
+    한 번만 생성한 이 클라이언트를 관찰/순찰 스레드와 상태 캐시 소비자가 함께 사용합니다.
+    """
+    global _sqs_client
+    with _sqs_client_lock:
+        if _sqs_client is None:
+            _sqs_client = boto3.session.Session().client(
+                'sqs', region_name=SQS_REGION, config=BotoConfig(max_pool_connections=16))
+        return _sqs_client
+
+
+def decode_message_body(message: dict):
+    """IoT manager Lambda가 보낸 SQS 메시지 본문을 파싱합니다.
+
+    Lambda와 같은 sqs_forwarder.decode_body를 사용하므로, content-encoding 속성이
+    'gzip+base64'인 본문은 먼저 압축을 해제하고 나머지는 일반 JSON으로 처리합니다.
+
+    Args:
+        message: receive_message가 반환한 SQS 메시지 (MessageAttributeNames=['All'])
+
+    Returns:
+        파싱된 메시지 본문
+
+    Raises:
+        json.JSONDecodeError: JSON이 아닌 본문
+    """
+    encoding = (message.get('MessageAttributes', {})
+                .get(sqs_forwarder.ENCODING_ATTRIBUTE, {})
+                .get('StringValue', sqs_forwarder.ENCODING_JSON))
+    try:
+        return sqs_forwarder.decode_body(message['Body'], encoding)
+    except (binascii.Error, OSError, UnicodeDecodeError) as e:
+        raise json.JSONDecodeError(f"Invalid {encoding} body: {e}", message['Body'], 0)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+decode_message_body 왕복 테스트 스크립트 (sqs_forwarder.encode_body로 만든 본문을 디코딩)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.shared import sqs_forwarder
+from utils.sqs_util import decode_message_body
+
+
+def _sqs_message(event, encoding, min_compress_bytes=1024):
+    """forward_event가 보내는 것과 같은 본문과 속성을 가진 receive_message 결과"""
+    body, used_encoding = sqs_forwarder.encode_body(event, encoding, min_compress_bytes)
+    return {
+        'Body': body,
+        'MessageAttributes': {
+            sqs_forwarder.ENCODING_ATTRIBUTE: {'StringValue': used_encoding, 'DataType': 'String'}
+        }
+    }, used_encoding
+
+
+def test_round_trip():
+    """json / gzip+base64 본문이 원래 이벤트로 복원되는지 확인합니다."""
+    event = {
+        'robot_id': 'robo-dog-001',
+        'filename': 's3://bucket/detected/frame_00001.jpg',
+        'results': [{'class': 'fire', 'confidence': 0.91, 'risk_level': 'HIGH'}] * 40,
+        'message': '화재 감지',
+    }
+    cases = [
+        (sqs_forwarder.ENCODING_JSON, 1024, sqs_forwarder.ENCODING_JSON),
+        (sqs_forwarder.ENCODING_GZIP, 1024, sqs_forwarder.ENCODING_GZIP),
+        # 작은 본문은 gzip을 요청해도 JSON 그대로 전송됨
+        (sqs_forwarder.ENCODING_GZIP, 1024 * 1024, sqs_forwarder.ENCODING_JSON),
+    ]
+    for encoding, min_compress_bytes, expected in cases:
+        message, used_encoding = _sqs_message(event, encoding, min_compress_bytes)
+        assert used_encoding == expected, (encoding, used_encoding)
+        assert decode_message_body(message) == event, encoding
+        print(f"✅ {encoding} (min {min_compress_bytes}B) -> {used_encoding}")
+
+    # 속성이 없는 본문은 JSON으로 처리
+    assert decode_message_body({'Body': json.dumps(event)}) == event
+    print("✅ content-encoding 속성 없음 -> json")
+
+
+def test_invalid_body():
+    """깨진 gzip+base64 본문은 JSONDecodeError로 보고됩니다."""
+    message = {
+        'Body': 'not-base64!',
+        'MessageAttributes': {
+            sqs_forwarder.ENCODING_ATTRIBUTE: {'StringValue': sqs_forwarder.ENCODING_GZIP}
+        }
+    }
+    try:
+        decode_message_body(message)
+    except json.JSONDecodeError as e:
+        print(f"✅ 예상된 에러 발생: {e.msg}")
+    else:
+        raise AssertionError("invalid gzip+base64 body was decoded")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_invalid_body()
+    print("\n🎉 모든 테스트가 완료되었습니다!")
@@ -0,0 +1,73 @@
+"""
+Robot action registry shared by the robot controller Lambda and the MCP interface Lambda.
+
+The create scripts bundle this file next to lambda_function.py, so both Lambdas resolve
+aliases and build MQTT payloads the same way. Unknown actions are rejected before publishing.
+"""
+
+import json
+import uuid
+
+# Robot move name -> accepted aliases (Korean and English). The agent runtime's intent
+# router routes exactly these phrases, so conversational forms belong here as well.
+ACTIONS = {
+    'detected': ['탐지'],
+    'from0to1': [],
+    'from1to2': [],
+    'from2to0': [],
+    'normal': [],
+    'stop_move': ['stop', '멈춰', '멈춰봐', '정지', '정지해', '그만', '그만해', '그만둬', 'stop moving'],
+    'stand': ['일어서', '일어서봐', '일어나', 'stand up'],
+    'sit': ['앉아', '앉아봐', 'sit down'],
+    'hello': ['안녕', '안녕하세요', '인사', '인사해', '인사해봐'],
+    'stretch': ['피곤해', '스트레칭'],
+    'scrape': [],
+    'heart': ['행복해', '반가워', '하트'],
+    'dance1': ['dance', '춤춰', '춤춰봐', '춤 춰봐'],
+    'dance2': [],
+}
+
+# Compiled once at import: every alias (and the move name itself) -> move name
+ACTION_TABLE = {}
+for _move, _aliases in ACTIONS.items():
+    for _alias in [_move] + _aliases:
+        ACTION_TABLE[_alias] = _move
+
+# Pre-serialized payload prefixes: '{"move": ["sit"]' (say/correlation_id are appended)
+_MOVE_PREFIXES = {move: json.dumps({"move": [move]})[:-1] for move in ACTIONS}
+
+
+class UnknownActionError(ValueError):
+    """Raised when an action is not a registered move or alias"""
+
+    def __init__(self, action):
+        self.action = action
+        super().__init__(
+            f"Unsupported action: {action}. Supported actions: {', '.join(ACTIONS)}"
+        )
+
+
+def resolve_action(action) -> str:
+    """Return the move name for an action or alias, raising UnknownActionError otherwise"""
+    if not isinstance(action, str) or not action.strip():
+        raise UnknownActionError(action)
+    action = action.strip()
+    move = ACTION_TABLE.get(action) or ACTION_TABLE.get(action.lower())
+    if move is None:
+        raise UnknownActionError(action)
+    return move
+
+
+def new_correlation_id() -> str:
+    """Correlation ID stamped on a command and echoed back by the robot in its feedback"""
+    return uuid.uuid4().hex
+
+
+def build_payload(action, message=None, correlation_id=None) -> str:
+    """Build the MQTT payload for an action, e.g. {"move": ["sit"], "say": "...", "correlation_id": "..."}"""
+    payload = _MOVE_PREFIXES[resolve_action(action)]
+    if message:
+        payload += ', "say": ' + json.dumps(str(message))
+    if correlation_id:
+        payload += ', "correlation_id": ' + json.dumps(correlation_id)
+    return payload + '}'
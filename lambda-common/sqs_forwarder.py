@@ -0,0 +1,175 @@
+"""
+IoT rule -> SQS FIFO forwarding shared by the detection, feedback and gesture manager Lambdas.
+
+The create scripts bundle this file next to lambda_function.py. Events are trimmed to the
+fields consumers read, arrays delivered by the IoT rule are sent with send_message_batch,
+and bodies can optionally be gzip+base64 encoded (flagged by the content-encoding attribute).
+Each robot gets its own FIFO message group, so robots are ordered independently of each other.
+The agent runtime decodes the bodies with the same constants (deploy scripts bundle it there too).
+"""
+
+import base64
+import gzip
+import json
+import re
+
+# SQS limits
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_BYTES = 256 * 1024
+
+# Message attribute that tells consumers how to decode the body
+ENCODING_ATTRIBUTE = 'content-encoding'
+ENCODING_JSON = 'json'
+ENCODING_GZIP = 'gzip+base64'
+
+# Fields read from robo_detection messages by the agent runtime and the frontend
+DETECTION_FIELDS = (
+    'filename', 'roi_filename', 'thumbnail_filename',
+    'timestamp', 'results', 'risk_level', 'correlation_id', 'robot_id',
+)
+
+# Fields read from robo_feedback messages (command status, position, action and battery)
+FEEDBACK_FIELDS = (
+    'status', 'message', 'action', 'move', 'last_action', 'position', 'location', 'pose',
+    'sensors', 'battery', 'timestamp', 'correlation_id', 'robot_id',
+)
+
+# Field of robo_gesture messages that carries the recognized gesture label (absent = no gesture)
+GESTURE_LABEL_FIELD = 'gesture'
+# Labels the gesture pipeline publishes in GESTURE_LABEL_FIELD
+GESTURE_LABELS = ('wave', 'help', 'ok', 'stop')
+# Fields read from robo_gesture messages (label, its confidence and the S3 image)
+GESTURE_FIELDS = (
+    GESTURE_LABEL_FIELD, 'confidence', 'filename', 'timestamp', 'correlation_id', 'robot_id',
+)
+
+# Payload fields that name the robot, in priority order
+ROBOT_ID_FIELDS = ('robot_id', 'thing_name')
+# Attribute added by an IoT rule SQL such as: SELECT *, clientid() AS iot_client_id
+CLIENT_ID_ATTRIBUTE = 'iot_client_id'
+
+# MessageGroupId allows up to 128 alphanumeric/punctuation characters
+_GROUP_ID_INVALID = re.compile(r'[^A-Za-z0-9!-/:-@\[-`{-~]')
+
+
+def trim_event(event, fields=None):
+    """Keep only the given fields (all when None) and drop null values"""
+    if not isinstance(event, dict):
+        return event
+    return {
+        key: value for key, value in event.items()
+        if value is not None and (fields is None or key in fields)
+    }
+
+
+def robot_id_of(event, default=None):
+    """Robot/thing name from the payload (robot_id, thing_name) or the MQTT client ID"""
+    if isinstance(event, dict):
+        for field in ROBOT_ID_FIELDS + (CLIENT_ID_ATTRIBUTE,):
+            if event.get(field):
+                return str(event[field])
+    return default
+
+
+def message_group_id(base_group_id, robot_id=None):
+    """Per-robot FIFO group, e.g. robo-detection-group.robo-dog-001 (base group when unknown)"""
+    if not robot_id:
+        return base_group_id
+    return f"{base_group_id}.{_GROUP_ID_INVALID.sub('_', robot_id)}"[:128]
+
+
+def _prepare(event, fields, default_robot_id):
+    """Trim an event and stamp robot_id on it; returns (message, robot_id)"""
+    robot_id = robot_id_of(event, default_robot_id)
+    if isinstance(event, dict):
+        event = {key: value for key, value in event.items() if key != CLIENT_ID_ATTRIBUTE}
+        if robot_id:
+            event['robot_id'] = robot_id
+    return trim_event(event, fields), robot_id
+
+
+def encode_body(event, encoding=ENCODING_JSON, min_compress_bytes=1024):
+    """Serialize an event; returns (body, encoding actually used)
+
+    Small bodies stay plain JSON because gzip+base64 only pays off above ~1KB.
+    """
+    body = json.dumps(event, ensure_ascii=False, separators=(',', ':'))
+    if encoding == ENCODING_GZIP and len(body.encode('utf-8')) >= min_compress_bytes:
+        compressed = gzip.compress(body.encode('utf-8'))
+        return base64.b64encode(compressed).decode('ascii'), ENCODING_GZIP
+    return body, ENCODING_JSON
+
+
+def decode_body(body, encoding=ENCODING_JSON):
+    """Inverse of encode_body"""
+    if encoding == ENCODING_GZIP:
+        body = gzip.decompress(base64.b64decode(body)).decode('utf-8')
+    return json.loads(body)
+
+
+def _message_attributes(encoding):
+    return {
+        'source': {
+            'StringValue': 'iot-core',
+            'DataType': 'String'
+        },
+        ENCODING_ATTRIBUTE: {
+            'StringValue': encoding,
+            'DataType': 'String'
+        }
+    }
+
+
+def _chunk_entries(entries):
+    """Split batch entries by the SQS entry count and total payload size limits"""
+    chunk, chunk_bytes = [], 0
+    for entry in entries:
+        size = len(entry['MessageBody'].encode('utf-8'))
+        if chunk and (len(chunk) == MAX_BATCH_ENTRIES or chunk_bytes + size > MAX_BATCH_BYTES):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(entry)
+        chunk_bytes += size
+    if chunk:
+        yield chunk
+
+
+def forward_event(sqs, queue_url, event, group_id, dedup_id,
+                  fields=None, encoding=ENCODING_JSON, min_compress_bytes=1024, robot_id=None):
+    """Forward an IoT event (a single message or an array of messages) to a FIFO queue
+
+    group_id is the base group; each message goes to the group of its robot
+    (robot_id_of, falling back to the robot_id argument).
+    Returns a dict with the sent message IDs and any failed batch entries.
+    """
+    if not isinstance(event, list):
+        message, message_robot_id = _prepare(event, fields, robot_id)
+        body, used_encoding = encode_body(message, encoding, min_compress_bytes)
+        response = sqs.send_message(
+            QueueUrl=queue_url,
+            MessageBody=body,
+            MessageGroupId=message_group_id(group_id, message_robot_id),
+            MessageDeduplicationId=dedup_id,
+            MessageAttributes=_message_attributes(used_encoding)
+        )
+        return {'sent': [response['MessageId']], 'failed': []}
+
+    entries = []
+    for index, item in enumerate(event):
+        message, message_robot_id = _prepare(item, fields, robot_id)
+        body, used_encoding = encode_body(message, encoding, min_compress_bytes)
+        entries.append({
+            'Id': str(index),
+            'MessageBody': body,
+            'MessageGroupId': message_group_id(group_id, message_robot_id),
+            'MessageDeduplicationId': f"{dedup_id}-{index}",
+            'MessageAttributes': _message_attributes(used_encoding)
+        })
+
+    result = {'sent': [], 'failed': []}
+    # Chunks are sent in order so each FIFO group keeps the array order
+    for chunk in _chunk_entries(entries):
+        response = sqs.send_message_batch(QueueUrl=queue_url, Entries=chunk)
+        result['sent'] += [entry['MessageId'] for entry in response.get('Successful', [])]
+        result['failed'] += response.get('Failed', [])
+    return result
@@ -2,46 +2,55 @@ import json
 import boto3
 import os
 import traceback
+from sqs_forwarder import GESTURE_FIELDS, forward_event
+
+# Created once per container and reused across warm invocations
+sqs = boto3.client('sqs')
+region = os.environ.get('AWS_REGION', 'us-west-2')
+queue_url = None
+
+# 'json' (default) or 'gzip+base64'; consumers decode using the content-encoding attribute
+payload_encoding = os.environ.get('PAYLOAD_ENCODING', 'json')
 
 def lambda_handler(event, context):
+    global queue_url
     print(f"event: {event}")
     print(f"context: {context}")
     
     try:
-        # Create SQS client
-        sqs = boto3.client('sqs')
-        region = os.environ.get('AWS_REGION', 'us-west-2')
-        account_id = context.invoked_function_arn.split(':')[4]
-        
-        # Construct SQS FIFO queue URL
-        queue_url = f"https://sqs.{region}.amazonaws.com/{account_id}/robo_gesture.fifo"
+        if queue_url is None:
+            account_id = context.invoked_function_arn.split(':')[4]
+            # Construct SQS FIFO queue URL
+            queue_url = f"https://sqs.{region}.amazonaws.com/{account_id}/robo_gesture.fifo"
         
-        # Send event to SQS FIFO queue
-        response = sqs.send_message(
-            QueueUrl=queue_url,
-            MessageBody=json.dumps(event),
-            MessageGroupId='robo-gesture-group',  # Required for FIFO queue
-            MessageDeduplicationId=str(context.aws_request_id),  # Required for FIFO queue
-            MessageAttributes={
-                'source': {
-                    'StringValue': 'iot-core',
-                    'DataType': 'String'
-                },
-                'timestamp': {
-                    'StringValue': str(context.aws_request_id),
-                    'DataType': 'String'
-                }
-            }
+        # Arrays delivered by the IoT rule are sent with send_message_batch
+        result = forward_event(
+            sqs,
+            queue_url,
+            event,
+            group_id='robo-gesture-group',  # Base FIFO group, suffixed with the robot ID per message
+            dedup_id=str(context.aws_request_id),  # Required for FIFO queue
+            fields=GESTURE_FIELDS,
+            encoding=payload_encoding
         )
         
-        print(f"Message sent to SQS: {response['MessageId']}")
+        print(f"Messages sent to SQS: {result['sent']}")
+        if result['failed']:
+            print(f"Failed batch entries: {result['failed']}")
+            return {
+                'statusCode': 500,
+                'body': json.dumps({
+                    'error': 'Some messages could not be pushed to SQS',
+                    'messageIds': result['sent'],
+                    'failed': result['failed']
+                })
+            }
         
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': 'Event successfully pushed to SQS',
-                'messageId': response['MessageId'],
-                'event': event
+                'messageIds': result['sent']
             })
         }
         
@@ -51,7 +60,6 @@ def lambda_handler(event, context):
         return {
             'statusCode': 500,
             'body': json.dumps({
-                'error': str(e),
-                'event': event
+                'error': str(e)
             })
         }
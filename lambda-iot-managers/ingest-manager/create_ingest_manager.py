@@ -0,0 +1,25 @@
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..'))
+from iot_manager_setup import IoTManagerDeployer
+
+# Streams routed by the ingest Lambda; rule names match the per-stream managers so
+# deploying this script takes over their topics
+STREAMS = [
+    {'topic': 'data/edge/firedetected', 'rule_name': 'robo_detection_rule', 'queue': 'robo_detection'},
+    {'topic': 'robo/feedback', 'rule_name': 'robo_feedback_rule', 'queue': 'robo_feedback'},
+    {'topic': 'data/edge/gesture', 'rule_name': 'robo_gesture_rule', 'queue': 'robo_gesture'},
+]
+
+# The Lambda routes by iot_topic and groups by iot_client_id
+RULE_SELECT = "*, topic() AS iot_topic, clientid() AS iot_client_id"
+
+
+def main():
+    IoTManagerDeployer(script_dir, STREAMS, RULE_SELECT).main()
+
+
+if __name__ == "__main__":
+    main()
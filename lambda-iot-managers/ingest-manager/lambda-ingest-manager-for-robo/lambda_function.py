@@ -0,0 +1,154 @@
+import json
+import boto3
+import os
+import time
+import traceback
+from sqs_forwarder import CLIENT_ID_ATTRIBUTE, DETECTION_FIELDS, FEEDBACK_FIELDS, GESTURE_FIELDS, forward_event
+
+# Created once per container and shared by all three streams
+sqs = boto3.client('sqs')
+region = os.environ.get('AWS_REGION', 'ap-northeast-2')
+account_id = None
+
+# 'json' (default) or 'gzip+base64'; consumers decode using the content-encoding attribute
+payload_encoding = os.environ.get('PAYLOAD_ENCODING', 'json')
+
+# IoT topic -> stream (queue, FIFO group, fields kept in the body)
+STREAMS = {
+    os.environ.get('DETECTION_TOPIC', 'data/edge/firedetected'): {
+        'name': 'detection',
+        'queue': 'robo_detection',
+        'group_id': 'robo-detection-group',
+        'fields': DETECTION_FIELDS
+    },
+    os.environ.get('FEEDBACK_TOPIC', 'robo/feedback'): {
+        'name': 'feedback',
+        'queue': 'robo_feedback',
+        'group_id': 'robo-feedback-group',
+        'fields': FEEDBACK_FIELDS
+    },
+    os.environ.get('GESTURE_TOPIC', 'data/edge/gesture'): {
+        'name': 'gesture',
+        'queue': 'robo_gesture',
+        'group_id': 'robo-gesture-group',
+        'fields': GESTURE_FIELDS
+    }
+}
+
+# Attributes added by the IoT rule SQL:
+# SELECT *, topic() AS iot_topic, clientid() AS iot_client_id FROM '<topic>'
+TOPIC_ATTRIBUTE = 'iot_topic'
+
+cold_start = True
+
+def put_metrics(stream, sent, failed, elapsed_ms):
+    """Per-topic metrics in CloudWatch Embedded Metric Format (no extra API call)"""
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': 'Robo/IoTIngest',
+                'Dimensions': [['Stream']],
+                'Metrics': [
+                    {'Name': 'MessagesSent', 'Unit': 'Count'},
+                    {'Name': 'MessagesFailed', 'Unit': 'Count'},
+                    {'Name': 'ForwardLatency', 'Unit': 'Milliseconds'},
+                    {'Name': 'ColdStart', 'Unit': 'Count'}
+                ]
+            }]
+        },
+        'Stream': stream,
+        'MessagesSent': sent,
+        'MessagesFailed': failed,
+        'ForwardLatency': elapsed_ms,
+        'ColdStart': 1 if cold_start else 0
+    }))
+
+def split_event(event):
+    """Return (topic, payload, client_id); {"messages": [...]} payloads are forwarded as a batch
+
+    The MQTT client ID (thing name) selects the per-robot FIFO group for messages
+    that do not carry their own robot_id.
+    """
+    if not isinstance(event, dict):
+        return None, event, None
+    payload = dict(event)
+    topic = payload.pop(TOPIC_ATTRIBUTE, None)
+    client_id = payload.pop(CLIENT_ID_ATTRIBUTE, None)
+    if list(payload) == ['messages'] and isinstance(payload['messages'], list):
+        payload = payload['messages']
+    return topic, payload, client_id
+
+def lambda_handler(event, context):
+    global account_id, cold_start
+    print(f"event: {event}")
+    print(f"context: {context}")
+
+    topic, payload, client_id = split_event(event)
+    stream = STREAMS.get(topic)
+    print(f"topic: {topic}, stream: {stream['name'] if stream else None}")
+
+    if stream is None:
+        print(f"No stream is registered for topic: {topic}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps({
+                'error': f"Unknown topic: {topic}. Supported topics: {', '.join(STREAMS)}"
+            })
+        }
+
+    start = time.perf_counter()
+    try:
+        if account_id is None:
+            account_id = context.invoked_function_arn.split(':')[4]
+        queue_url = f"https://sqs.{region}.amazonaws.com/{account_id}/{stream['queue']}.fifo"
+
+        result = forward_event(
+            sqs,
+            queue_url,
+            payload,
+            group_id=stream['group_id'],
+            dedup_id=str(context.aws_request_id),
+            fields=stream['fields'],
+            encoding=payload_encoding,
+            robot_id=client_id
+        )
+    except Exception as e:
+        print(f"Error pushing to SQS: {str(e)}")
+        traceback.print_exc()
+        put_metrics(stream['name'], 0, len(payload) if isinstance(payload, list) else 1,
+                    round((time.perf_counter() - start) * 1000, 2))
+        cold_start = False
+        return {
+            'statusCode': 500,
+            'body': json.dumps({
+                'error': str(e),
+                'stream': stream['name']
+            })
+        }
+
+    put_metrics(stream['name'], len(result['sent']), len(result['failed']),
+                round((time.perf_counter() - start) * 1000, 2))
+    cold_start = False
+
+    print(f"Messages sent to SQS ({stream['name']}): {result['sent']}")
+    if result['failed']:
+        print(f"Failed batch entries: {result['failed']}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({
+                'error': 'Some messages could not be pushed to SQS',
+                'stream': stream['name'],
+                'messageIds': result['sent'],
+                'failed': result['failed']
+            })
+        }
+
+    return {
+        'statusCode': 200,
+        'body': json.dumps({
+            'message': 'Event successfully pushed to SQS',
+            'stream': stream['name'],
+            'messageIds': result['sent']
+        })
+    }
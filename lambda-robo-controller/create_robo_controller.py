@@ -6,6 +6,7 @@ import os
 import traceback
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
+robot_actions_path = os.path.join(script_dir, '..', 'lambda-common', 'robot_actions.py')
 config_path = os.path.join(script_dir, "config.json")
 
 def load_config():
@@ -308,6 +309,8 @@ def create_lambda_function_arn():
                     file_path = os.path.join(root, file)
                     arcname = os.path.relpath(file_path, lambda_dir)
                     zip_file.write(file_path, arcname)
+            # Bundle the shared action registry next to lambda_function.py
+            zip_file.write(robot_actions_path, 'robot_actions.py')
         print(f"✓ Lambda function zip created successfully: {lambda_function_zip_path}")
     except Exception as e:
         print(f"Failed to create Lambda function zip: {e}")
@@ -525,8 +528,8 @@ def add_lambda_permission_for_iot(lambda_function_name, lambda_function_arn):
 def test_robo_controller(lambda_function_name, action, message):
     try:
         payload = {
-            'action': 'HAPPY',
-            'message': 'Hello, I am happy'
+            'action': action,
+            'message': message
         }
         print(f"payload: {payload}")
 
@@ -551,7 +554,7 @@ def main():
 
     time.sleep(5)
 
-    action = 'HAPPY'
+    action = '행복해'
     message = '오늘은 정말 멋지네요!'
     print(f"action: {action}, message: {message}")
     test_robo_controller(lambda_function_name, action, message)
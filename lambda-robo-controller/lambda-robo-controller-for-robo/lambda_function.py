@@ -1,63 +1,26 @@
-import json
 import boto3
 import os
 import traceback
-
-bedrock_agent_runtime_client = boto3.client("bedrock-agent-runtime")
+from robot_actions import build_payload, new_correlation_id, UnknownActionError
 
 topic = os.environ.get('TOPIC', 'robot/control')
 
-def command_robot(action: str, message: str, debug: bool = False) -> str:
+# Created once per container and reused across warm invocations
+iot_client = boto3.client(
+    'iot-data',
+    region_name='ap-northeast-2'
+)
+
+def command_robot(action: str, message: str, debug: bool = False, correlation_id: str = None) -> str:
     print('action: ', action)
     print('debug mode: ', debug)
 
-    say = ""
     if message:
         print('message: ', message)
-        say = message
-    
-    move = ""
-    if action == "탐지" or action == "detected":
-        move = ['detected']
-    elif action == "from1to2":
-        move = ['from1to2']
-    elif action == "from2to0":
-        move = ['from2to0']
-    elif action == "from0to1":
-        move = ['from0to1']
-    elif action == "normal":
-        move = ['normal']
-    elif action == "stop_move":
-        move = ['stop_move']
-    elif action == "stand":
-        move = ['stand']
-    elif action == "sit":
-        move = ['sit']
-    elif action == "hello":
-        move = ['hello']
-    elif action == "stretch":
-        move = ['stretch']
-    elif action == "scrape":
-        move = ['scrape']
-    elif action == "heart":
-        move = ['heart']
-    elif action == "dance1":
-        move = ['dance1']
-    elif action == "dance2":
-        move = ['dance2']
-    else:
-        move = [action]
-    
-    if say:
-        payload = json.dumps({
-            "move": move,
-            "say": say, 
-        })
-    else:
-        payload = json.dumps({
-            "move": move
-        })
-                        
+
+    # Raises UnknownActionError before anything is published
+    payload = build_payload(action, message, correlation_id)
+
     print('topic: ', topic)
 
     # Skip MQTT publish and perform simulation only in debug mode
@@ -68,22 +31,17 @@ def command_robot(action: str, message: str, debug: bool = False) -> str:
 
     # Perform actual MQTT publish if not in debug mode
     try:
-        client = boto3.client(
-            'iot-data',
-            region_name='ap-northeast-2'
-        )
-        
-        response = client.publish(
+        response = iot_client.publish(
             topic = topic,
             qos = 1,
             payload = payload
         )
-        print('response: ', response)     
-        return True   
-            
+        print('response: ', response)
+        return True
+
     except Exception:
         err_msg = traceback.format_exc()
-        print('error message: ', err_msg)                    
+        print('error message: ', err_msg)
         return False
 
 def lambda_handler(event, context):
@@ -96,10 +54,32 @@ def lambda_handler(event, context):
     print(f"message: {message}")
     debug = event.get('debug', False)  # Add debug parameter, default value is False
     print(f"debug: {debug}")
+    # Stamped on the MQTT payload; the robot echoes it back in its feedback message
+    correlation_id = event.get('correlation_id') or new_correlation_id()
+    print(f"correlation_id: {correlation_id}")
 
-    result = command_robot(action, message, debug)
+    try:
+        result = command_robot(action, message, debug, correlation_id)
+    except UnknownActionError as e:
+        print(f"error message: {e}")
+        return {
+            'statusCode': 400,
+            'body': str(e)
+        }
     print(f"result: {result}")
+    # response_version 2 matches the MCP command tool: body {published, correlation_id}.
+    # Version 1 (default) keeps the boolean body for existing clients and returns
+    # correlation_id next to it.
+    if event.get('response_version') == 2:
+        return {
+            'statusCode': 200 if result else 500,
+            'body': {
+                'published': result,
+                'correlation_id': correlation_id
+            }
+        }
     return {
-        'statusCode': 200, 
-        'body': result
+        'statusCode': 200,
+        'body': result,
+        'correlation_id': correlation_id
     }
@@ -0,0 +1,103 @@
+"""
+Measure cold vs warm command_robot latency against a local IoT data plane stub.
+
+Starts an HTTP server that accepts iot-data Publish calls, points boto3 at it through
+AWS_ENDPOINT_URL_IOT_DATA_PLANE, and compares:
+  - cold: module import (client creation) + first invocation
+  - warm: subsequent invocations reusing the module-level client
+  - per-invocation client: creating boto3.client('iot-data') on every call (previous behaviour)
+
+Usage:
+    python measure_publish_latency.py [iterations]
+"""
+
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+lambda_path = os.path.join(script_dir, "lambda-robo-controller-for-robo", "lambda_function.py")
+
+# The shared action registry is bundled into the zip at deploy time
+sys.path.insert(0, os.path.join(script_dir, "..", "lambda-common"))
+
+
+class IoTDataPlaneStub(BaseHTTPRequestHandler):
+    """Accepts POST /topics/{topic} and returns an empty Publish response"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), IoTDataPlaneStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return {
+        'p50_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[int(len(samples) * 0.95) - 1], 3),
+        'mean_ms': round(statistics.mean(samples), 3),
+    }
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    server = start_stub_server()
+    os.environ['AWS_ENDPOINT_URL_IOT_DATA_PLANE'] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+    import boto3
+
+    # Cold start: module import creates the client, then the first publish
+    start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location("robo_controller_lambda", lambda_path)
+    lambda_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(lambda_module)
+    lambda_module.print = lambda *args, **kwargs: None  # silence per-invocation logging
+    assert lambda_module.command_robot('sit', '앉습니다')
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    warm = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        assert lambda_module.command_robot('앉아', '앉습니다')
+        warm.append((time.perf_counter() - start) * 1000)
+
+    per_invocation = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        client = boto3.client('iot-data', region_name='ap-northeast-2')
+        client.publish(topic='robot/control', qos=1, payload=json.dumps({"move": ["sit"], "say": "앉습니다"}))
+        per_invocation.append((time.perf_counter() - start) * 1000)
+
+    server.shutdown()
+
+    print(json.dumps({
+        'iterations': iterations,
+        'cold_ms': round(cold_ms, 3),
+        'warm': percentiles(warm),
+        'per_invocation_client': percentiles(per_invocation),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""IndustrialSafetyDetector 단계별 성능 벤치마크
+
+데이터셋 이미지나 학습된 모델 없이도 실행되도록, 재현 가능한 합성 프레임과
+동일한 출력 형태([1, 16, 8400])를 갖는 작은 랜덤 가중치 ONNX 모델을 생성합니다.
+preprocess / inference / postprocess / draw 단계를 따로 측정하고
+해상도별 p50/p95/p99(ms)를 JSON으로 출력합니다.
+
+사용 예:
+    python benchmark_detector.py
+    python benchmark_detector.py --resolutions 1280x720 1920x1080 --iterations 50 --output bench.json
+    python benchmark_detector.py --model runs/detect/industrial_safety_final/weights/best.onnx
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+
+from onnx_inference_final import IndustrialSafetyDetector
+
+DEFAULT_RESOLUTIONS = ['640x480', '1280x720', '1920x1080']
+NUM_OUTPUTS = 16  # 4 (box) + 12 (classes)
+STRIDES = (8, 16, 32)  # 80*80 + 40*40 + 20*20 = 8400
+STAGES = ('preprocess', 'inference', 'postprocess', 'draw')
+
+
+def build_random_model(model_path, seed=0, class_bias=-4.5):
+    """YOLOv8 헤드와 같은 [1, 16, 8400] 출력을 내는 랜덤 가중치 ONNX 모델 생성
+
+    class_bias로 클래스 점수를 낮춰 실제 모델처럼 소수의 박스만 임계값을 넘도록 합니다.
+    """
+    rng = np.random.default_rng(seed)
+    initializers = []
+    nodes = []
+    heads = []
+
+    for stride in STRIDES:
+        fan_in = 3 * stride * stride
+        weight = rng.normal(0, 1.0 / np.sqrt(fan_in), (NUM_OUTPUTS, 3, stride, stride)).astype(np.float32)
+        bias = np.zeros(NUM_OUTPUTS, dtype=np.float32)
+        bias[4:] = class_bias
+        initializers += [
+            numpy_helper.from_array(weight, f'w{stride}'),
+            numpy_helper.from_array(bias, f'b{stride}'),
+        ]
+        nodes += [
+            helper.make_node('Conv', ['images', f'w{stride}', f'b{stride}'], [f'conv{stride}'],
+                             kernel_shape=[stride, stride], strides=[stride, stride]),
+            helper.make_node('Reshape', [f'conv{stride}', 'head_shape'], [f'head{stride}']),
+        ]
+        heads.append(f'head{stride}')
+
+    # box 채널은 640 좌표계, class 채널은 0~1 확률이 되도록 스케일링
+    scale = np.ones((1, NUM_OUTPUTS, 1), dtype=np.float32)
+    scale[0, :2, 0] = 640.0
+    scale[0, 2:4, 0] = 160.0
+    initializers += [
+        numpy_helper.from_array(np.array([1, NUM_OUTPUTS, -1], dtype=np.int64), 'head_shape'),
+        numpy_helper.from_array(scale, 'scale'),
+    ]
+    nodes += [
+        helper.make_node('Concat', heads, ['concat'], axis=2),
+        helper.make_node('Sigmoid', ['concat'], ['sigmoid']),
+        helper.make_node('Mul', ['sigmoid', 'scale'], ['output0']),
+    ]
+
+    graph = helper.make_graph(
+        nodes, 'random_yolo_head',
+        [helper.make_tensor_value_info('images', TensorProto.FLOAT, [1, 3, 640, 640])],
+        [helper.make_tensor_value_info('output0', TensorProto.FLOAT, [1, NUM_OUTPUTS, 8400])],
+        initializer=initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 8  # 구버전 onnxruntime에서도 로드 가능하도록 고정
+    onnx.checker.check_model(model)
+    onnx.save(model, model_path)
+    return model_path
+
+
+def make_synthetic_frame(width, height, seed=0):
+    """그라디언트 배경 + 랜덤 사각형으로 구성된 재현 가능한 프레임 (JPEG 크기가 실제와 유사하도록)"""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    frame = np.stack([
+        np.broadcast_to(x, (height, width)),
+        np.broadcast_to(y, (height, width)),
+        (x + y) / 2,
+    ], axis=-1).astype(np.uint8)
+
+    for _ in range(20):
+        x1, y1 = int(rng.integers(0, width - 1)), int(rng.integers(0, height - 1))
+        x2 = min(width - 1, x1 + int(rng.integers(10, max(11, width // 4))))
+        y2 = min(height - 1, y1 + int(rng.integers(10, max(11, height // 4))))
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, -1)
+
+    noise = rng.integers(0, 16, frame.shape, dtype=np.uint8)
+    return cv2.add(frame, noise)
+
+
+def percentiles(samples_ms):
+    values = np.asarray(samples_ms)
+    return {
+        'p50': round(float(np.percentile(values, 50)), 3),
+        'p95': round(float(np.percentile(values, 95)), 3),
+        'p99': round(float(np.percentile(values, 99)), 3),
+        'mean': round(float(values.mean()), 3),
+    }
+
+
+def benchmark_resolution(detector, image_path, iterations, warmup):
+    timings = {stage: [] for stage in STAGES}
+    box_counts = []
+
+    for i in range(warmup + iterations):
+        t0 = time.perf_counter()
+        input_data, original_img = detector.preprocess(image_path)
+        t1 = time.perf_counter()
+        outputs = detector.session.run(None, {detector.input_name: input_data})
+        t2 = time.perf_counter()
+        boxes = detector.postprocess(outputs, original_img)
+        t3 = time.perf_counter()
+        detector.draw_results(original_img, boxes)
+        t4 = time.perf_counter()
+
+        if i < warmup:
+            continue
+        for stage, elapsed in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+            timings[stage].append(elapsed * 1000)
+        box_counts.append(len(boxes))
+
+    result = {stage: percentiles(samples) for stage, samples in timings.items()}
+    result['total'] = percentiles([sum(stage_ms) for stage_ms in zip(*timings.values())])
+    result['boxes_mean'] = round(float(np.mean(box_counts)), 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IndustrialSafetyDetector 단계별 벤치마크")
+    parser.add_argument('--model', help="측정할 ONNX 모델 경로 (미지정 시 랜덤 가중치 모델 생성)")
+    parser.add_argument('--resolutions', nargs='+', default=DEFAULT_RESOLUTIONS,
+                        help="WIDTHxHEIGHT 형식의 프레임 해상도 목록")
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="결과 JSON 저장 경로 (미지정 시 stdout)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        model_path = args.model or build_random_model(os.path.join(work_dir, 'random_yolo.onnx'), seed=args.seed)
+        detector = IndustrialSafetyDetector(model_path)
+
+        report = {
+            'model': args.model or 'random_weights',
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+            'seed': args.seed,
+            'unit': 'ms',
+            'resolutions': {},
+        }
+        for resolution in args.resolutions:
+            width, height = (int(v) for v in resolution.lower().split('x'))
+            image_path = os.path.join(work_dir, f'frame_{width}x{height}.jpg')
+            cv2.imwrite(image_path, make_synthetic_frame(width, height, seed=args.seed))
+            report['resolutions'][resolution] = benchmark_resolution(
+                detector, image_path, args.iterations, args.warmup)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"💾 Benchmark saved: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
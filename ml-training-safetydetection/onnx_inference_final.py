@@ -3,9 +3,34 @@ import onnxruntime as ort
 import cv2
 import numpy as np
 import os
+import json
+
+from risk_scorer import RISK_LEVELS, RISK_MEDIUM, RiskScorer
+
+# postprocess 결과 레코드: 박스당 dict 대신 고정 크기 구조체 배열 사용
+DETECTION_DTYPE = np.dtype([
+    ('class_id', np.uint8),
+    ('confidence', np.float32),
+    ('bbox', np.int16, (4,)),   # x1, y1, x2, y2
+    ('risk_level', np.uint8),   # RISK_LEVELS 인덱스
+])
 
 class IndustrialSafetyDetector:
-    def __init__(self, model_path):
+    # 위험 상황으로 취급하는 클래스 (hazards_only 렌더링 및 위험 체크에 사용)
+    HAZARD_CLASSES = ('explosion', 'fire', 'person_down', 'emergency_situation')
+
+    LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+    LABEL_SCALE = 0.5
+    LABEL_THICKNESS = 2
+
+    # 업로드용 이미지 설정 (전체 프레임 / 위험 영역 crop / 썸네일)
+    FULL_JPEG_QUALITY = 85
+    ROI_JPEG_QUALITY = 90
+    THUMBNAIL_JPEG_QUALITY = 70
+    THUMBNAIL_MAX_SIDE = 480
+    ROI_MARGIN = 0.15
+
+    def __init__(self, model_path, risk_scorer=None):
         self.session = ort.InferenceSession(model_path)
         self.input_name = self.session.get_inputs()[0].name
         
@@ -30,12 +55,33 @@ class IndustrialSafetyDetector:
             11: (0, 165, 255),   # emergency_situation - orange
         }
 
+        self.hazard_class_ids = frozenset(
+            class_id for class_id, name in self.class_names.items()
+            if name in self.HAZARD_CLASSES
+        )
+
+        # class_id로 바로 인덱싱하는 lookup 테이블
+        num_classes = len(self.class_names)
+        self.class_name_table = [self.class_names[i] for i in range(num_classes)]
+        self.color_table = [self.colors.get(i, (128, 128, 128)) for i in range(num_classes)]
+        self.hazard_mask = np.array([i in self.hazard_class_ids for i in range(num_classes)])
+
+        # 클래스별 라벨 크기를 미리 계산 (신뢰도는 항상 "0.00" 형식이라 폭이 고정됨)
+        self.label_sizes = [
+            cv2.getTextSize(f"{name}: 0.00", self.LABEL_FONT,
+                            self.LABEL_SCALE, self.LABEL_THICKNESS)[0]
+            for name in self.class_name_table
+        ]
+
+        self.risk_scorer = risk_scorer or RiskScorer(self.class_names)
+
     def preprocess(self, image_path):
-        img = cv2.imread(image_path)
+        """image_path는 파일 경로 또는 이미 읽은 BGR 프레임(np.ndarray)입니다."""
+        img = image_path if isinstance(image_path, np.ndarray) else cv2.imread(image_path)
         if img is None:
             raise ValueError(f"Cannot load image: {image_path}")
         
-        original_img = img.copy()
+        original_img = img
         img = cv2.resize(img, (640, 640))
         img = img.transpose(2, 0, 1)  # HWC to CHW
         img = img.astype(np.float32) / 255.0
@@ -44,72 +90,106 @@ class IndustrialSafetyDetector:
         return img, original_img
 
     def postprocess(self, outputs, original_img, conf_threshold=0.1):
-        # YOLO output format: [batch, 16, 8400] -> [batch, 8400, 16]
-        predictions = outputs[0].transpose(0, 2, 1)
-        boxes = []
+        """YOLO 출력을 DETECTION_DTYPE 구조체 배열로 변환합니다 (입력 순서 유지)."""
+        # YOLO output format: [batch, 16, 8400], 배치 0만 사용
+        predictions = outputs[0][0]
         
-        for i in range(predictions.shape[1]):
-            detection = predictions[0, i, :]
-            
-            # 클래스 확률들 (4번째 인덱스부터)
-            class_scores = detection[4:]
-            confidence = np.max(class_scores)
-            
-            if confidence > conf_threshold:
-                class_id = np.argmax(class_scores)
-                x_center, y_center, width, height = detection[:4]
-                
-                # Convert to original image size
-                h, w = original_img.shape[:2]
-                x_center *= w / 640
-                y_center *= h / 640
-                width *= w / 640
-                height *= h / 640
-                
-                x1 = int(x_center - width / 2)
-                y1 = int(y_center - height / 2)
-                x2 = int(x_center + width / 2)
-                y2 = int(y_center + height / 2)
-                
-                # 유효한 바운딩 박스인지 확인
-                if x1 >= 0 and y1 >= 0 and x2 <= w and y2 <= h and x2 > x1 and y2 > y1:
-                    boxes.append({
-                        'class_id': class_id,
-                        'class_name': self.class_names[class_id],
-                        'confidence': confidence,
-                        'bbox': (x1, y1, x2, y2)
-                    })
-        
-        return boxes
-
-    def draw_results(self, image, boxes):
-        for box in boxes:
-            x1, y1, x2, y2 = box['bbox']
-            class_name = box['class_name']
-            confidence = box['confidence']
-            class_id = box['class_id']
-            
+        # 클래스 확률들 (4번째 인덱스부터)
+        class_scores = predictions[4:]
+        class_ids = class_scores.argmax(axis=0)
+        confidences = class_scores.max(axis=0)
+        keep = confidences > conf_threshold
+        
+        # Convert to original image size
+        h, w = original_img.shape[:2]
+        x_center, y_center, width, height = predictions[:4, keep]
+        x_center = x_center * (w / 640)
+        y_center = y_center * (h / 640)
+        half_w = width * (w / 640) / 2
+        half_h = height * (h / 640) / 2
+        
+        # int() 변환과 동일하게 0 방향으로 절삭
+        bboxes = np.stack([
+            x_center - half_w, y_center - half_h,
+            x_center + half_w, y_center + half_h,
+        ], axis=1).astype(np.int32)
+        x1, y1, x2, y2 = bboxes.T
+        
+        # 유효한 바운딩 박스인지 확인
+        valid = (x1 >= 0) & (y1 >= 0) & (x2 <= w) & (y2 <= h) & (x2 > x1) & (y2 > y1)
+        
+        detections = np.empty(int(valid.sum()), dtype=DETECTION_DTYPE)
+        detections['class_id'] = class_ids[keep][valid]
+        detections['confidence'] = confidences[keep][valid]
+        detections['bbox'] = bboxes[valid]
+        detections['risk_level'] = self.risk_scorer.score(detections, original_img.shape)
+        
+        return detections
+
+    def draw_results(self, image, detections, hazards_only=False):
+        if hazards_only:
+            detections = detections[self.hazard_mask[detections['class_id']]]
+
+        for class_id, confidence, (x1, y1, x2, y2) in zip(
+                detections['class_id'].tolist(),
+                detections['confidence'].tolist(),
+                detections['bbox'].tolist()):
             # 색상 선택
-            color = self.colors.get(class_id, (128, 128, 128))
+            color = self.color_table[class_id]
             
             # 바운딩 박스 그리기
             cv2.rectangle(image, (x1, y1), (x2, y2), color, 2)
             
-            # 라벨 텍스트
-            label = f"{class_name}: {confidence:.2f}"
-            label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
+            # 라벨 텍스트 (크기는 __init__에서 미리 계산)
+            label = f"{self.class_name_table[class_id]}: {confidence:.2f}"
+            label_w, label_h = self.label_sizes[class_id]
             
             # 라벨 배경
-            cv2.rectangle(image, (x1, y1 - label_size[1] - 10), 
-                         (x1 + label_size[0], y1), color, -1)
+            cv2.rectangle(image, (x1, y1 - label_h - 10), 
+                         (x1 + label_w, y1), color, -1)
             
             # 라벨 텍스트
-            cv2.putText(image, label, (x1, y1 - 5), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+            cv2.putText(image, label, (x1, y1 - 5), self.LABEL_FONT,
+                        self.LABEL_SCALE, (255, 255, 255), self.LABEL_THICKNESS)
         
         return image
 
-    def predict(self, image_path, output_path=None):
+    def to_results(self, detections, ndigits=2):
+        """robo_detection 메시지의 results 형식으로 변환합니다.
+
+        Returns:
+            [{'class': str, 'confidence': float, 'position': [x1, y1, x2, y2], 'risk_level': str}, ...]
+        """
+        confidences = np.round(detections['confidence'].astype(np.float64), ndigits).tolist()
+        return [
+            {
+                'class': self.class_name_table[class_id],
+                'confidence': confidence,
+                'position': position,
+                'risk_level': RISK_LEVELS[risk_level],
+            }
+            for class_id, confidence, position, risk_level in zip(
+                detections['class_id'].tolist(),
+                confidences,
+                detections['bbox'].tolist(),
+                detections['risk_level'].tolist())
+        ]
+
+    def to_json(self, detections, ndigits=2):
+        return json.dumps(self.to_results(detections, ndigits), separators=(',', ':'))
+
+    def predict(self, image_path, output_path=None, render=False, hazards_only=False):
+        """이미지에서 객체를 감지합니다.
+
+        결과 이미지는 output_path가 주어지거나 render=True일 때만 그립니다.
+        로봇에서는 박스 목록만 필요한 경우가 대부분이므로 기본값은 렌더링 생략입니다.
+        렌더링은 복사본에 하므로 전달한 프레임은 그대로이며, prepare_upload_images에는
+        박스가 그려지지 않은 원본 프레임을 넘기세요.
+
+        Returns:
+            (detections, result_img) - detections는 DETECTION_DTYPE 구조체 배열,
+            렌더링하지 않은 경우 result_img는 None
+        """
         # 전처리
         input_data, original_img = self.preprocess(image_path)
         
@@ -119,8 +199,11 @@ class IndustrialSafetyDetector:
         # 후처리
         boxes = self.postprocess(outputs, original_img)
         
-        # 결과 그리기
-        result_img = self.draw_results(original_img.copy(), boxes)
+        if not (render or output_path):
+            return boxes, None
+        
+        # 결과 그리기 (호출자의 프레임에 박스가 남지 않도록 복사본에 그림)
+        result_img = self.draw_results(original_img.copy(), boxes, hazards_only=hazards_only)
         
         # 결과 저장
         if output_path:
@@ -128,6 +211,58 @@ class IndustrialSafetyDetector:
         
         return boxes, result_img
 
+    def crop_hazard_roi(self, image, detections, margin=ROI_MARGIN):
+        # 위험 클래스 박스들을 모두 포함하는 영역을 여백과 함께 잘라냄
+        bboxes = detections['bbox'][self.hazard_mask[detections['class_id']]].astype(np.int32)
+        if len(bboxes) == 0:
+            return None
+
+        x1, y1 = bboxes[:, :2].min(axis=0).tolist()
+        x2, y2 = bboxes[:, 2:].max(axis=0).tolist()
+        pad_x = int((x2 - x1) * margin)
+        pad_y = int((y2 - y1) * margin)
+
+        h, w = image.shape[:2]
+        x1, y1 = max(0, x1 - pad_x), max(0, y1 - pad_y)
+        x2, y2 = min(w, x2 + pad_x), min(h, y2 + pad_y)
+        return image[y1:y2, x1:x2]
+
+    def make_thumbnail(self, image, max_side=THUMBNAIL_MAX_SIDE):
+        h, w = image.shape[:2]
+        scale = max_side / max(h, w)
+        if scale >= 1.0:
+            return image
+        # 축소에는 INTER_AREA가 품질/속도 모두 유리
+        return cv2.resize(image, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def encode_jpeg(image, quality):
+        ok, buffer = cv2.imencode('.jpg', image, [
+            cv2.IMWRITE_JPEG_QUALITY, quality,
+            cv2.IMWRITE_JPEG_OPTIMIZE, 1,
+        ])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        return buffer.tobytes()
+
+    def prepare_upload_images(self, image, detections, min_risk_level=RISK_MEDIUM):
+        """S3 업로드용 JPEG 바이트를 생성합니다.
+
+        robo_detection 메시지의 키 이름(filename, roi_filename, thumbnail_filename)을
+        그대로 사용하며, 위험 클래스가 없으면 roi_filename은 None입니다.
+        프레임 위험도가 min_risk_level 미만이면 인코딩 없이 None을 반환합니다 (None이면 항상 생성).
+        image는 박스를 그리기 전의 원본 프레임이어야 합니다 (predict의 result_img가 아님).
+        """
+        if min_risk_level is not None and not self.risk_scorer.should_upload(detections, min_risk_level):
+            return None
+
+        roi = self.crop_hazard_roi(image, detections)
+        return {
+            'filename': self.encode_jpeg(image, self.FULL_JPEG_QUALITY),
+            'roi_filename': self.encode_jpeg(roi, self.ROI_JPEG_QUALITY) if roi is not None else None,
+            'thumbnail_filename': self.encode_jpeg(self.make_thumbnail(image), self.THUMBNAIL_JPEG_QUALITY),
+        }
+
 def main():
     # 모델 로드
     model_path = "runs/detect/industrial_safety_final/weights/best.onnx"
@@ -156,12 +291,12 @@ def main():
                 danger_detected = False
                 normal_objects = []
                 
-                for box in boxes:
-                    class_name = box['class_name']
-                    confidence = box['confidence']
+                for result in detector.to_results(boxes):
+                    class_name = result['class']
+                    confidence = result['confidence']
                     
-                    if class_name in ['explosion', 'fire', 'person_down', 'emergency_situation']:
-                        print(f"🚨 위험 감지: {class_name} (신뢰도: {confidence:.2f})")
+                    if class_name in IndustrialSafetyDetector.HAZARD_CLASSES:
+                        print(f"🚨 위험 감지: {class_name} (신뢰도: {confidence:.2f}, 위험도: {result['risk_level']})")
                         danger_detected = True
                     else:
                         normal_objects.append(f"{class_name}: {confidence:.2f}")
@@ -0,0 +1,86 @@
+"""감지 결과에 대한 규칙/임계값 기반 위험도 평가
+
+postprocess 직후 엣지에서 실행되어 모든 감지 결과에 risk_level(LOW/MEDIUM/HIGH)을 부여합니다.
+LLM이 클래스 이름으로 위험도를 추론할 필요가 없고, LOW 프레임은 업로드 전에 걸러낼 수 있습니다.
+
+평가 순서:
+1. 클래스별 기본 위험도
+2. 신뢰도가 낮은 위험 감지는 한 단계 하향
+3. 화면 대비 면적이 큰 감지는 한 단계 상향
+4. 함께 감지되면 위험한 클래스 조합(예: fire + person_down)은 HIGH
+"""
+import numpy as np
+
+RISK_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+RISK_LOW, RISK_MEDIUM, RISK_HIGH = range(len(RISK_LEVELS))
+
+DEFAULT_CLASS_RISK = {
+    'explosion': RISK_HIGH,
+    'fire': RISK_HIGH,
+    'person_down': RISK_HIGH,
+    'emergency_situation': RISK_HIGH,
+    'steam': RISK_MEDIUM,
+}
+
+DEFAULT_CO_OCCURRENCE = (
+    ('fire', 'person_down'),
+    ('explosion', 'person_down'),
+    ('fire', 'explosion'),
+)
+
+
+class RiskScorer:
+    def __init__(self, class_names, class_risk=None, co_occurrence=DEFAULT_CO_OCCURRENCE,
+                 min_confidence=0.3, large_area_ratio=0.1, co_occurrence_confidence=0.25):
+        class_risk = DEFAULT_CLASS_RISK if class_risk is None else class_risk
+        num_classes = len(class_names)
+        name_to_id = {name: class_id for class_id, name in class_names.items()}
+
+        # class_id로 인덱싱하는 기본 위험도 테이블
+        self.base_risk = np.array(
+            [class_risk.get(class_names[i], RISK_LOW) for i in range(num_classes)], dtype=np.int8)
+        self.co_occurrence = [
+            np.array([name_to_id[name] for name in group])
+            for group in co_occurrence
+        ]
+        self.min_confidence = min_confidence
+        self.large_area_ratio = large_area_ratio
+        self.co_occurrence_confidence = co_occurrence_confidence
+
+    def score(self, detections, frame_shape):
+        """DETECTION_DTYPE 배열의 각 감지 결과에 대한 위험도 코드(uint8) 배열을 반환합니다."""
+        class_ids = detections['class_id']
+        confidences = detections['confidence']
+        risk = self.base_risk[class_ids].copy()
+        if len(detections) == 0:
+            return risk.astype(np.uint8)
+
+        elevated = risk > RISK_LOW
+
+        # 신뢰도가 낮은 위험 감지는 한 단계 하향
+        risk[elevated & (confidences < self.min_confidence)] -= 1
+
+        # 화면의 큰 부분을 차지하는 위험 감지는 한 단계 상향
+        h, w = frame_shape[:2]
+        bboxes = detections['bbox'].astype(np.int32)
+        area_ratio = (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1]) / float(h * w)
+        risk[elevated & (area_ratio >= self.large_area_ratio)] += 1
+
+        # 위험 클래스 조합이 같은 프레임에 있으면 해당 감지들을 HIGH로
+        confident = confidences >= self.co_occurrence_confidence
+        confident_ids = class_ids[confident]
+        for group in self.co_occurrence:
+            if np.isin(group, confident_ids).all():
+                risk[confident & np.isin(class_ids, group)] = RISK_HIGH
+
+        return np.clip(risk, RISK_LOW, RISK_HIGH).astype(np.uint8)
+
+    @staticmethod
+    def frame_risk(detections):
+        """프레임 전체 위험도 (감지 결과 중 최고 위험도, 없으면 LOW)"""
+        if len(detections) == 0:
+            return RISK_LOW
+        return int(detections['risk_level'].max())
+
+    def should_upload(self, detections, min_level=RISK_MEDIUM):
+        return self.frame_risk(detections) >= min_level